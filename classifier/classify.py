@@ -5,12 +5,18 @@
 # Example runs:
 #  python classify.py --image data/validation/good/Set04-good.10.35.png
 #  python classify.py --image data/validation/bad/Set05-bad.09.27.png
+#  python classify.py --image data/validation/good/Set04-good.10.35.png --image data/validation/bad/Set05-bad.09.27.png
+#  python classify.py --model classifier.current.keras --image data/validation/good/Set04-good.10.35.png
+#  python classify.py --trt_model classifier_trt --image data/validation/good/Set04-good.10.35.png
+#  python classify.py --tflite_model classifier_int8.tflite --image data/validation/good/Set04-good.10.35.png
 
 import argparse
+import functools
 import numpy as np
 import sys
+import tensorflow as tf
 
-from keras.preprocessing import image
+from tensorflow.keras import backend as K
 from PIL import Image
 
 from model import create_model
@@ -18,43 +24,203 @@ from model import create_model
 target_size = (150, 150)
 
 
-def predict(nn, img, target_size):
-  """Run model prediction on image
+def preprocess(imgs, target_size):
+  """Convert images into a batch suitable as model input
   Args:
-    model: keras model
-    img: PIL format image
+    imgs: list of PIL format images
     target_size: (w,h) tuple
   Returns:
-    list of predicted labels and their probabilities
+    float32 numpy array with one image per sample, with pixel values in [0,255] as expected by the model
   """
-  if img.size != target_size:
-    img = img.resize(target_size)
+  # Fill all images into one pre-allocated buffer, so that the images are converted to float only
+  # once and no intermediate per-image arrays have to be allocated, stacked and copied.
+  if K.image_data_format() == 'channels_first':
+    batch = np.empty((len(imgs), 3, target_size[1], target_size[0]), dtype=np.float32)
+  else:
+    batch = np.empty((len(imgs), target_size[1], target_size[0], 3), dtype=np.float32)
+
+  for i, img in enumerate(imgs):
+    if img.size != target_size:
+      # Bilinear resampling is much cheaper than the bicubic default and makes no difference to
+      # the classifier at this size. Use Pillow-SIMD (see requirements.txt) to vectorize it.
+      img = img.resize(target_size, Image.BILINEAR)
+    x = np.asarray(img, dtype=np.float32)
+    batch[i] = x.transpose(2, 0, 1) if K.image_data_format() == 'channels_first' else x
+
+  return batch
+
+
+def decode_image(path):
+  """Load an image file for classification, using TensorFlow's image decoders
+  Images with an alpha channel (such as the PNG bean images) are composited over white, as the model expects.
+  Args:
+    path: path to a PNG or JPEG file
+  Returns:
+    float32 tensor of shape (h,w,3), with pixel values in [0,255]
+  """
+  img = tf.io.decode_image(tf.io.read_file(path), expand_animations=False)
+  if img.shape[-1] in (2, 4):
+    alpha = tf.cast(img[..., -1:], tf.float32) / 255.0
+    img = tf.cast(img[..., :-1], tf.float32) * alpha + 255.0 * (1.0 - alpha)
+  else:
+    img = tf.cast(img, tf.float32)
+  if img.shape[-1] == 1:
+    img = tf.image.grayscale_to_rgb(img)
+  return img
+
+
+def load_batch(paths, target_size):
+  """Load image files into a batch suitable as model input
+  Args:
+    paths: list of paths to PNG or JPEG files
+    target_size: (w,h) tuple
+  Returns:
+    float32 numpy array with one image per sample, with pixel values in [0,255] as expected by the model
+  """
+  batch = tf.stack([tf.image.resize(decode_image(path), (target_size[1], target_size[0])) for path in paths])
+  if K.image_data_format() == 'channels_first':
+    batch = tf.transpose(batch, (0, 3, 1, 2))
+  return batch.numpy()
+
+
+@functools.lru_cache(maxsize=1)
+def get_model(path='classifier_weights.h5'):
+  """Create the classifier model, once per process
+  Args:
+    path: either weights saved by train.py (.h5 file), or the complete model saved by train.py (.keras file), which
+      loads faster as it needs no model construction and layer-by-layer weight assignment
+  Returns:
+    keras model, ready for prediction
+  """
+  # Grappler graph optimizations for inference (both are usually on by default already).
+  tf.config.optimizer.set_experimental_options({'layout_optimizer': True, 'constant_folding': True})
+
+  if path.endswith('.keras'):
+    nn = tf.keras.models.load_model(path, compile=False)
+  else:
+    nn = create_model(target_size[0], target_size[1])
+    nn.load_weights(path)
+  nn.trainable = False
+  return nn
+
+
+def make_infer(nn, target_size, batch_size=1):
+  """Compile the forward pass of a keras model into a graph function
+  Calling that directly avoids the per-call overhead of nn.predict() (input checks, batching, callbacks), which
+  dominates when classifying few images at a time.
+  Args:
+    nn: keras model
+    target_size: (w,h) tuple
+    batch_size: batch size to compile the function for in advance. XLA compiles it again for every other
+      batch size, so use the batch size that will be classified.
+  Returns:
+    function mapping a batch as returned by load_batch() or preprocess() to the predictions
+  """
+  if K.image_data_format() == 'channels_first':
+    sample_shape = [3, target_size[1], target_size[0]]
+  else:
+    sample_shape = [target_size[1], target_size[0], 3]
+
+  @tf.function(input_signature=[tf.TensorSpec([None] + sample_shape, tf.float32)], jit_compile=True)
+  def forward(x):
+    return nn(x, training=False)
+
+  # Trace and compile now rather than during the first classification.
+  forward(tf.zeros([batch_size] + sample_shape))
+
+  def infer(batch):
+    return forward(tf.constant(batch)).numpy()
 
-  x = image.img_to_array(img)
-  x = np.expand_dims(x, axis=0)
-  x /= 255.0
-  return nn.predict(x)
+  return infer
+
+
+def predict_batch(nn, imgs, target_size):
+  """Run model prediction on a batch of images
+  Args:
+    nn: keras model
+    imgs: list of PIL format images
+    target_size: (w,h) tuple
+  Returns:
+    list of predicted labels and their probabilities, one per image
+  """
+  return nn.predict(preprocess(imgs, target_size), batch_size=len(imgs))
+
+
+def load_trt_model(path):
+  """Load the TensorRT optimized model as saved by export_trt.py
+  Args:
+    path: directory of the TensorRT SavedModel
+  Returns:
+    function mapping a batch as returned by load_batch() or preprocess() to the predictions
+  """
+  # The signature function does not keep the loaded variables alive by itself, so infer() has to
+  # keep a reference to saved_model.
+  saved_model = tf.saved_model.load(path)
+  input_name = list(saved_model.signatures['serving_default'].structured_input_signature[1])[0]
+
+  def infer(batch):
+    outputs = saved_model.signatures['serving_default'](**{input_name: tf.constant(batch)})
+    return list(outputs.values())[0].numpy()
+
+  return infer
+
+
+def load_tflite_model(path):
+  """Load the quantized TensorFlow Lite model as saved by quantize.py
+  Args:
+    path: path to the .tflite file
+  Returns:
+    function mapping a batch as returned by load_batch() or preprocess() to the predictions
+  """
+  interpreter = tf.lite.Interpreter(model_path=path)
+  interpreter.allocate_tensors()
+  input_details = interpreter.get_input_details()[0]
+  output_details = interpreter.get_output_details()[0]
+
+  def infer(batch):
+    if tuple(interpreter.get_input_details()[0]['shape']) != batch.shape:
+      interpreter.resize_tensor_input(input_details['index'], batch.shape)
+      interpreter.allocate_tensors()
+
+    # Quantize the input and dequantize the output using the calibrated value ranges.
+    scale, zero_point = input_details['quantization']
+    if input_details['dtype'] != np.float32:
+      limits = np.iinfo(input_details['dtype'])
+      batch = np.clip(np.round(batch / scale + zero_point), limits.min, limits.max)
+      batch = batch.astype(input_details['dtype'])
+    interpreter.set_tensor(input_details['index'], batch)
+    interpreter.invoke()
+    preds = interpreter.get_tensor(output_details['index'])
+    scale, zero_point = output_details['quantization']
+    if output_details['dtype'] != np.float32:
+      preds = (preds.astype(np.float32) - zero_point) * scale
+    return preds
+
+  return infer
 
 
 if __name__=="__main__":
   a = argparse.ArgumentParser()
-  a.add_argument("--image", help="path to image")
+  a.add_argument("--image", action="append", help="path to image; can be given multiple times")
+  a.add_argument("--model", default="classifier_weights.h5", help="path to the trained weights (.h5) or model (.keras)")
+  a.add_argument("--trt_model", help="path to a TensorRT model saved by export_trt.py, to use instead of the Keras model")
+  a.add_argument("--tflite_model", help="path to a quantized model saved by quantize.py, to use instead of the Keras model")
   args = a.parse_args()
 
   if args.image is None:
     a.print_help()
     sys.exit(1)
 
-  png = Image.open(args.image)
-
-  # PNG images have an alpha channel that we don't need. Remove it.
-  img = Image.new("RGB", png.size, (255, 255, 255))
-  img.paste(png, mask=png.split()[3])
+  batch = load_batch(args.image, target_size)
 
+  if args.trt_model:
+    infer = load_trt_model(args.trt_model)
+  elif args.tflite_model:
+    infer = load_tflite_model(args.tflite_model)
+  else:
+    infer = make_infer(get_model(args.model), target_size, batch_size=len(batch))
 
-  # Create the neural network and load its weights.
-  nn = create_model(target_size[0], target_size[1])
-  nn.load_weights('classifier_weights.h5')
+  preds = infer(batch)
 
-  preds = predict(nn, img, target_size)
-  print(preds)
+  for path, pred in zip(args.image, preds):
+    print(path, pred)
@@ -37,11 +37,11 @@ data/
 ```
 '''
 
-from keras.preprocessing.image import ImageDataGenerator
-from keras.models import Sequential
-from keras.layers import Conv2D, MaxPooling2D
-from keras.layers import Activation, Dropout, Flatten, Dense
-from keras import backend as K
+from tensorflow.keras.preprocessing.image import ImageDataGenerator
+from tensorflow.keras.models import Sequential
+from tensorflow.keras.layers import Conv2D, MaxPooling2D
+from tensorflow.keras.layers import Activation, Dropout, Flatten, Dense
+from tensorflow.keras import backend as K
 
 from model import create_model
 
@@ -63,8 +63,8 @@ model.compile(loss='binary_crossentropy',
               metrics=['accuracy'])
 
 # this is the augmentation configuration we will use for training
+# (no rescaling, as the model from model.py normalizes its input itself)
 train_datagen = ImageDataGenerator(
-    rescale=1. / 255,
     shear_range=0.2,
     rotation_range=180,
     width_shift_range=0.2,
@@ -72,8 +72,8 @@ train_datagen = ImageDataGenerator(
     horizontal_flip=True)
 
 # this is the augmentation configuration we will use for testing:
-# only rescaling
-test_datagen = ImageDataGenerator(rescale=1. / 255)
+# none
+test_datagen = ImageDataGenerator()
 
 train_generator = train_datagen.flow_from_directory(
     train_data_dir,
@@ -0,0 +1,123 @@
+import os
+import tensorflow as tf
+
+# File name extensions of the images to use, as supported by tf.io.decode_image(). Other files in the data
+# directories are ignored.
+image_extensions = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+
+
+def class_names(data_dir):
+  """Determine the class names of a data directory.
+
+  Sorted the same way as by ImageDataGenerator.flow_from_directory(), so that class indices (and with that,
+  trained weights) stay compatible.
+
+  Args:
+    data_dir: Directory containing one subdirectory of images per class.
+  """
+  return sorted(d for d in os.listdir(data_dir) if os.path.isdir(os.path.join(data_dir, d)))
+
+
+def image_files(data_dir):
+  """List the image files of a data directory.
+
+  Args:
+    data_dir: Directory containing one subdirectory of images per class.
+
+  Returns:
+    Sorted list of paths of all images in the class subdirectories.
+  """
+  return sorted(path for path in tf.io.gfile.glob(os.path.join(data_dir, '*', '*'))
+                if path.lower().endswith(image_extensions))
+
+
+class RandomShear(tf.keras.layers.Layer):
+  """Random shear augmentation, as done by ImageDataGenerator(shear_range=…) in Keras 2.1.5.
+
+  Every image is sheared by its own random angle, around the image center and parallel to its height, filling
+  areas outside the image with the nearest pixels. Expects images in channels_last format.
+
+  Args:
+    shear_range: Maximum shear angle in radians, in both directions.
+  """
+
+  def __init__(self, shear_range, **kwargs):
+    super().__init__(**kwargs)
+    self.shear_range = shear_range
+
+  def call(self, images, training=True):
+    if not training:
+      return images
+
+    shear = tf.random.uniform([tf.shape(images)[0]], -self.shear_range, self.shear_range)
+    center_x = (tf.cast(tf.shape(images)[2], tf.float32) - 1) / 2
+    zeros = tf.zeros_like(shear)
+    # Projective transforms [a0, a1, a2, b0, b1, b2, c0, c1] that map output pixel (x, y) to input pixel
+    # (a0 x + a1 y + a2, b0 x + b1 y + b2), the same mapping as ImageDataGenerator's shear matrix.
+    transforms = tf.stack([
+        tf.cos(shear), zeros, center_x * (1 - tf.cos(shear)),
+        -tf.sin(shear), tf.ones_like(shear), center_x * tf.sin(shear),
+        zeros, zeros], axis=1)
+    return tf.raw_ops.ImageProjectiveTransformV3(
+        images=images, transforms=transforms, output_shape=tf.shape(images)[1:3], fill_value=0.0,
+        interpolation='BILINEAR', fill_mode='NEAREST')
+
+  def get_config(self):
+    return {**super().get_config(), 'shear_range': self.shear_range}
+
+
+def create_dataset(data_dir, img_width, img_height, batch_size, augment=False, cache_file='', preprocess=None):
+  """Build the input pipeline for training or validation images.
+
+  Decoding, resizing and augmentation run as TensorFlow ops in parallel threads, and batches are prefetched
+  while the model trains on the previous one. The decoded and resized images are cached after the first epoch,
+  so that later epochs only have to do the (random) augmentation.
+
+  Args:
+    data_dir: Directory containing one subdirectory of images per class.
+    img_width: Target width of the images (in pixels)
+    img_height: Target height of the images (in pixels)
+    batch_size: Number of images per batch
+    augment: Whether to apply random augmentation (used for the training images)
+    cache_file: File to cache the decoded images in, to reuse them in later training runs. By default, they are
+      cached in memory. Delete the cache file after changing the images or image dimensions.
+    preprocess: Function to convert a batch of float32 images with pixel values in [0,255] into the input format
+      of the model. By default, images are left unchanged, as the model from model.py normalizes them itself.
+
+  Returns:
+    tf.data.Dataset of (images, labels) batches, with preprocessed images and labels as class indices.
+  """
+  classes = tf.constant(class_names(data_dir))
+
+  def load(path):
+    label = tf.argmax(tf.cast(tf.equal(classes, tf.strings.split(path, os.sep)[-2]), tf.int32))
+    img = tf.io.decode_image(tf.io.read_file(path), channels=3, expand_animations=False)
+    img = tf.image.resize(img, (img_height, img_width))
+    # Cache as uint8, which needs only a quarter of the memory of float32.
+    return tf.cast(tf.round(img), tf.uint8), label
+
+  # Augmentation as done before with ImageDataGenerator: rotation by up to 180° in both directions, shifts by
+  # up to 20%, shear by up to 0.2 radians (about 11.5°) in both directions and horizontal flips.
+  # The layers run on the CPU as part of the input pipeline, so they always use float32, even when the model is
+  # trained with mixed precision.
+  augmentation = tf.keras.Sequential([
+      tf.keras.layers.RandomRotation(0.5, fill_mode='nearest', dtype='float32'),
+      tf.keras.layers.RandomTranslation(0.2, 0.2, fill_mode='nearest', dtype='float32'),
+      RandomShear(0.2, dtype='float32'),
+      tf.keras.layers.RandomFlip('horizontal', dtype='float32'),
+  ])
+
+  files = image_files(data_dir)
+  ds = tf.data.Dataset.from_tensor_slices(files)
+  ds = ds.map(load, num_parallel_calls=tf.data.AUTOTUNE)
+  ds = ds.cache(cache_file)
+  # Shuffle after caching, as the cache would otherwise fix the order of the first epoch.
+  if augment:
+    ds = ds.shuffle(len(files))
+  ds = ds.batch(batch_size)
+  ds = ds.map(lambda x, y: (tf.cast(x, tf.float32), y), num_parallel_calls=tf.data.AUTOTUNE)
+  if augment:
+    ds = ds.map(lambda x, y: (augmentation(x, training=True), y), num_parallel_calls=tf.data.AUTOTUNE)
+  if preprocess is not None:
+    ds = ds.map(lambda x, y: (preprocess(x), y), num_parallel_calls=tf.data.AUTOTUNE)
+  return ds.prefetch(tf.data.AUTOTUNE)
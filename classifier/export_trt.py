@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+# Convert the trained bean classifier into a TensorRT optimized model for fast inference on NVIDIA GPUs.
+#
+# TensorRT fuses layers, picks the fastest kernels for the GPU at hand and runs them in FP16 precision. The
+# conversion has to be done only once per set of weights (and per GPU model), on the machine that will run
+# the classifier. Use the result with: python classify.py --trt_model classifier_trt --image …
+#
+# Example run:
+#  python export_trt.py --weights classifier_weights.h5 --output classifier_trt
+#
+# For details about the conversion, see:
+# https://docs.nvidia.com/deeplearning/frameworks/tf-trt-user-guide/index.html
+
+import argparse
+import numpy as np
+import tensorflow as tf
+
+from tensorflow.python.compiler.tensorrt import trt_convert as trt
+
+from classify import get_model, target_size
+
+
+if __name__=="__main__":
+  a = argparse.ArgumentParser()
+  a.add_argument("--weights", default="classifier_weights.h5", help="path to the trained weights (.h5) or model (.keras)")
+  a.add_argument("--output", default="classifier_trt", help="directory to save the TensorRT model to")
+  a.add_argument("--batch_size", type=int, default=1, help="batch size to pre-build the TensorRT engine for")
+  args = a.parse_args()
+
+  # Save the Keras model in the SavedModel format, as that is the input format for the conversion.
+  saved_model_dir = args.output + '.savedmodel'
+  nn = get_model(args.weights)
+  tf.saved_model.save(nn, saved_model_dir)
+
+  # Convert to TensorRT, using FP16 precision where the GPU supports it.
+  converter = trt.TrtGraphConverterV2(
+      input_saved_model_dir=saved_model_dir,
+      precision_mode=trt.TrtPrecisionMode.FP16,
+      max_workspace_size_bytes=1 << 25)
+  converter.convert()
+
+  # Build the TensorRT engine now instead of on the first classification.
+  def input_fn():
+    yield (np.zeros((args.batch_size, target_size[1], target_size[0], 3), dtype=np.float32),)
+  converter.build(input_fn=input_fn)
+
+  converter.save(args.output)
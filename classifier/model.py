@@ -1,12 +1,18 @@
-from keras.layers import Activation, Dropout, Flatten, Dense
-from keras.layers import Conv2D, MaxPooling2D
-from keras.models import Sequential
-from keras import backend as K
+from types import SimpleNamespace
+
+import tensorflow as tf
+from tensorflow.keras.layers import Activation, Dropout, Flatten, Dense
+from tensorflow.keras.layers import Conv2D, MaxPooling2D, Rescaling
+from tensorflow.keras.models import Model, Sequential
+from tensorflow.keras import backend as K
+from tensorflow.keras import mixed_precision
 
 
 def create_model(img_width, img_height):
   """Build the model architecture.
 
+  The model expects images with pixel values in [0,255] and normalizes them itself.
+
   Args:
     img_width: Target width of the image (in pixels)
     img_height: Target height of the image (in pixels)
@@ -17,7 +23,10 @@ def create_model(img_width, img_height):
     input_shape = (img_width, img_height, 3)
 
   model = Sequential()
-  model.add(Conv2D(32, (3, 3), input_shape=input_shape))
+  # Normalizing inside the model lets TensorFlow fuse it with the first convolution, instead of having a separate
+  # pass over the input data. It has no weights, so weights saved without it can still be loaded.
+  model.add(Rescaling(1. / 255, input_shape=input_shape))
+  model.add(Conv2D(32, (3, 3)))
   model.add(Activation('relu'))
   model.add(MaxPooling2D(pool_size=(2, 2)))
 
@@ -34,6 +43,56 @@ def create_model(img_width, img_height):
   model.add(Activation('relu'))
   model.add(Dropout(0.5))
   model.add(Dense(1))
-  model.add(Activation('sigmoid'))
+  # Computed in float32 even with mixed precision, for numerically stable output and loss values.
+  model.add(Activation('sigmoid', dtype='float32'))
 
   return model
+
+
+class GradientAccumulationModel(Model):
+  """Model that updates its weights only after accumulating the gradients of several batches.
+
+  This gives the training results of a large batch size while only one small batch at a time has to fit into
+  (GPU) memory. Create it like a functional Model, with the additional argument:
+
+  Args:
+    accumulation_steps: Number of batches to accumulate the gradients of before updating the weights.
+  """
+
+  def __init__(self, *args, accumulation_steps=1, **kwargs):
+    super().__init__(*args, **kwargs)
+    self.accumulation_steps = accumulation_steps
+
+  def compile(self, *args, **kwargs):
+    super().compile(*args, **kwargs)
+    # (Re-)create the accumulators here, as the trainable variables change when (un)freezing layers between
+    # compile() calls. They are held in a SimpleNamespace so that Keras does not track them as model weights,
+    # which would make the saved weights incompatible with a plain Model.
+    self._accumulator = SimpleNamespace(
+        steps=tf.Variable(0, trainable=False, dtype=tf.int64),
+        gradients=[tf.Variable(tf.zeros_like(v), trainable=False) for v in self.trainable_variables])
+
+  def train_step(self, data):
+    x, y, sample_weight = tf.keras.utils.unpack_x_y_sample_weight(data)
+    loss_scaling = isinstance(self.optimizer, mixed_precision.LossScaleOptimizer)
+
+    with tf.GradientTape() as tape:
+      y_pred = self(x, training=True)
+      loss = self.compute_loss(x, y, y_pred, sample_weight)
+      if loss_scaling:
+        loss = self.optimizer.get_scaled_loss(loss)
+    gradients = tape.gradient(loss, self.trainable_variables)
+    if loss_scaling:
+      gradients = self.optimizer.get_unscaled_gradients(gradients)
+
+    for accumulated, gradient in zip(self._accumulator.gradients, gradients):
+      accumulated.assign_add(gradient / self.accumulation_steps)
+    self._accumulator.steps.assign_add(1)
+
+    if tf.equal(self._accumulator.steps % self.accumulation_steps, 0):
+      self.optimizer.apply_gradients(
+          zip([accumulated.read_value() for accumulated in self._accumulator.gradients], self.trainable_variables))
+      for accumulated in self._accumulator.gradients:
+        accumulated.assign(tf.zeros_like(accumulated))
+
+    return self.compute_metrics(x, y, y_pred, sample_weight)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+# Convert the trained bean classifier into an INT8 quantized TensorFlow Lite model for fast CPU inference.
+#
+# Post-training quantization calibrates the value ranges of all layers on a sample of real bean images and then
+# stores weights and activations as 8 bit integers. This makes the model four times smaller and lets CPUs use
+# their integer vector instructions. (FP16 quantization is not offered here, as CPUs without FP16 hardware would
+# get slower due to the additional type conversions.) Use the result with:
+#  python classify.py --tflite_model classifier_int8.tflite --image …
+#
+# Example run:
+#  python quantize.py --weights classifier_weights.h5 --output classifier_int8.tflite
+#
+# For details about the conversion, see:
+# https://www.tensorflow.org/lite/performance/post_training_integer_quant
+
+import argparse
+import random
+import tensorflow as tf
+
+from classify import get_model, load_batch, target_size
+from dataset import image_files
+
+# Number of images used to calibrate the value ranges of the quantized layers.
+nb_calibration_samples = 200
+
+# Seed for picking the calibration images, so that repeated conversions give the same model.
+calibration_seed = 0
+
+
+if __name__=="__main__":
+  a = argparse.ArgumentParser()
+  a.add_argument("--weights", default="classifier_weights.h5", help="path to the trained weights (.h5) or model (.keras)")
+  a.add_argument("--data", default="data/validation", help="directory with the images used for calibration")
+  a.add_argument("--output", default="classifier_int8.tflite", help="file to save the TensorFlow Lite model to")
+  args = a.parse_args()
+
+  nn = get_model(args.weights)
+
+  # A random sample of all classes. The first images in sorted order would mostly be from the first class.
+  files = image_files(args.data)
+  calibration_files = random.Random(calibration_seed).sample(files, min(nb_calibration_samples, len(files)))
+
+  def representative_dataset():
+    for path in calibration_files:
+      yield [load_batch([path], target_size)]
+
+  converter = tf.lite.TFLiteConverter.from_keras_model(nn)
+  converter.optimizations = [tf.lite.Optimize.DEFAULT]
+  converter.representative_dataset = representative_dataset
+  converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+  converter.inference_input_type = tf.uint8
+  converter.inference_output_type = tf.uint8
+
+  with open(args.output, 'wb') as f:
+    f.write(converter.convert())
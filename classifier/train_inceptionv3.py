@@ -12,12 +12,14 @@
 # - https://blog.keras.io/building-powerful-image-classification-models-using-very-little-data.html
 # - https://gist.github.com/fchollet/0830affa1f7f19fd47b06d4cf89ed44d
 
-from keras.applications.inception_v3 import InceptionV3
-from keras.preprocessing import image
-from keras.preprocessing.image import ImageDataGenerator
-from keras.models import Model, Sequential
-from keras.layers import Dense, GlobalAveragePooling2D
-from keras import backend as K
+from tensorflow.keras.applications.inception_v3 import InceptionV3, preprocess_input
+from tensorflow.keras.layers import Dense, GlobalAveragePooling2D, Input
+from tensorflow.keras.models import Model
+from tensorflow.keras import backend as K
+from tensorflow.keras import mixed_precision
+
+from dataset import create_dataset
+from model import GradientAccumulationModel
 
 import numpy as np
 import tensorflow as tf
@@ -26,7 +28,7 @@ import random as rn
 
 ## (1) Ensure reproducible training results.
 #
-# Follows this FAQ entry (except that it keeps multi-threading in place for training performance reasons):
+# Follows this FAQ entry (except that it keeps multi-threading in place by default for training performance reasons):
 # https://keras.io/getting-started/faq/#how-can-i-obtain-reproducible-results-using-keras-during-development
 
 # Make Python hash-based operations reproducible. See:
@@ -41,17 +43,20 @@ np.random.seed(42)
 # Start core Python generated random numbers from a well-defined state.
 rn.seed(12345)
 
-# Force TensorFlow to use single thread, as multiple ones are a source of non-reproducible results.
-# For details, see: https://stackoverflow.com/q/42022950
-session_conf = tf.ConfigProto(intra_op_parallelism_threads=1, inter_op_parallelism_threads=1)
+# Multiple threads are a source of non-reproducible results, but a single thread makes training many times slower
+# on multi-core machines. So only force TensorFlow to use a single thread and deterministic ops when running with
+# the environment variable DETERMINISTIC=1. For details, see: https://stackoverflow.com/q/42022950
+if os.environ.get('DETERMINISTIC'):
+    tf.config.threading.set_intra_op_parallelism_threads(1)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    tf.config.experimental.enable_op_determinism()
+else:
+    tf.config.threading.set_intra_op_parallelism_threads(os.cpu_count())
+    tf.config.threading.set_inter_op_parallelism_threads(2)
 
 # Start Tensorflow generated random numbers from a well-defined initial state.
-# For details, see: https://www.tensorflow.org/api_docs/python/tf/set_random_seed
-tf.set_random_seed(1234)
-
-# Activate the config built above (single thread, fixed random seed).
-sess = tf.Session(graph=tf.get_default_graph(), config=session_conf)
-K.set_session(sess)
+# For details, see: https://www.tensorflow.org/api_docs/python/tf/random/set_seed
+tf.random.set_seed(1234)
 
 
 ## (2) Set up the data sources.
@@ -59,8 +64,6 @@ K.set_session(sess)
 # Input data sources.
 train_data_dir = 'data/train'
 validation_data_dir = 'data/validation'
-nb_train_samples = 1367 # TODO: Determine this by counting files in train_data_dir.
-nb_validation_samples = 440 # TODO: Determine this by counting files in validation_data_dir.
 
 # Input image dimensions (scaled down from variable source sizes).
 # 299x299 is the standard input size for InceptionV3, but we can configure it.
@@ -71,73 +74,89 @@ img_width, img_height = 150,150
 epochs = 30
 
 # Number of training images to process in each step of each epoch.
-# Each epoch utilizes all training images, so  batch_size * steps = nb_train_samples. The model weights are updated
-# after each step of an epoch.
+# Each epoch utilizes all training images, so batch_size * steps = number of training images. The model weights
+# are updated after each step of an epoch. InceptionV3 needs a lot of GPU memory, so batches are kept small.
 batch_size = 16
 
+# Number of batches to accumulate gradients over before updating the model weights. This trains with an effective
+# batch size of batch_size * accumulation_steps = 64 while only needing GPU memory for batch_size images.
+accumulation_steps = 4
+
 
 # Data source for training images (augmentation used: multiple types).
-train_datagen = ImageDataGenerator(
-    rescale=1. / 255,
-    shear_range=0.2,
-    rotation_range=180,
-    width_shift_range=0.2,
-    height_shift_range=0.2,
-    horizontal_flip=True)
-train_generator = train_datagen.flow_from_directory(
-    train_data_dir,
-    target_size=(img_width, img_height),
-    batch_size=batch_size,
-    class_mode='binary')
-
-# Data source for validation images (augmentation used: rescaling only).
-test_datagen = ImageDataGenerator(rescale=1. / 255)
-validation_generator = test_datagen.flow_from_directory(
-    validation_data_dir,
-    target_size=(img_width, img_height),
-    batch_size=batch_size,
-    class_mode='binary')
+# InceptionV3 was pre-trained with pixel values scaled to [-1,1], so we have to use the same here. Otherwise
+# fine-tuning would first have to adapt the network to a different input distribution, needing more epochs.
+train_ds = create_dataset(train_data_dir, img_width, img_height, batch_size, augment=True,
+                          preprocess=preprocess_input)
+
+# Data source for validation images (augmentation used: none).
+validation_ds = create_dataset(validation_data_dir, img_width, img_height, batch_size,
+                               preprocess=preprocess_input)
 
 
 ## (3) Set up the model (InceptionV3 with some additional layers).
 
+# Compute in float16 while keeping the weights in float32 ("mixed precision") when training on a GPU. This roughly
+# halves training time on GPUs with Tensor Cores. model.compile() then also adds the loss scaling needed to keep
+# float16 gradients from underflowing. CPUs have no fast float16 arithmetic, so they keep using float32.
+if tf.config.list_physical_devices('GPU'):
+    mixed_precision.set_global_policy('mixed_float16')
+    # Use TF32 Tensor Core math for the remaining float32 ops on Ampere and newer GPUs.
+    tf.config.experimental.enable_tensor_float_32_execution(True)
+
 # Create the base pre-trained model.
 # The input_shape argument is in channels_last format, which has to be configured in ~/.keras/keras.json as:
 #   "image_data_format": "channels_last"
 base_model = InceptionV3(include_top=False, weights='imagenet', input_shape=(img_width, img_height, 3))
 
 # Add a global spatial average pooling layer.
-x = base_model.output
-x = GlobalAveragePooling2D()(x)
+features = GlobalAveragePooling2D()(base_model.output)
 
-# Add a fully-connected layer.
-x = Dense(1024, activation='relu')(x)
-
-# Add a logistic layer (for two classes only: good and bad beans).
-predictions = Dense(2, activation='softmax')(x)
+# The top layers, created separately so that they can be shared between the full model and a model of just the
+# top layers (see step (4)).
+# A fully-connected layer.
+top_dense = Dense(1024, activation='relu')
+# A logistic layer (for two classes only: good and bad beans).
+# Computed in float32 even with mixed precision, for numerically stable softmax and loss values.
+top_predictions = Dense(2, activation='softmax', dtype='float32')
 
 # Assemble the model we will train.
-model = Model(inputs=base_model.input, outputs=predictions)
+model = GradientAccumulationModel(
+    inputs=base_model.input, outputs=top_predictions(top_dense(features)), accumulation_steps=accumulation_steps)
 
 
 ## (4) First training step: top layers
 #
 # This trains only the top layers (which were randomly initialized), freezing all convolutional InceptionV3 layers.
+#
+# As the frozen InceptionV3 layers compute the same output for an image in every epoch, we run them only once per
+# image ("bottleneck features") and then train a model of just the top layers on these features. That makes this
+# step many times faster, at the cost of training without augmentation.
 
 for layer in base_model.layers:
     layer.trainable = False
 
+feature_model = Model(inputs=base_model.input, outputs=features)
+train_features_ds = create_dataset(train_data_dir, img_width, img_height, batch_size, preprocess=preprocess_input)
+train_features = feature_model.predict(train_features_ds).astype('float16')
+train_labels = np.concatenate([labels for _, labels in train_features_ds])
+validation_features = feature_model.predict(validation_ds).astype('float16')
+validation_labels = np.concatenate([labels for _, labels in validation_ds])
+
+features_input = Input(shape=train_features.shape[1:])
+top_model = Model(inputs=features_input, outputs=top_predictions(top_dense(features_input)))
+
 # Compile the model (should be done *after* setting layers to non-trainable).
-model.compile(optimizer='rmsprop', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
-# model.compile(optimizer='rmsprop', loss='categorical_crossentropy', metrics=['accuracy'])
+# The training step is compiled with XLA, which fuses ops into fewer kernels.
+top_model.compile(optimizer='rmsprop', loss='sparse_categorical_crossentropy', metrics=['accuracy'], jit_compile=True)
 
 # Train the model on the new data for a few epochs.
-model.fit_generator(
-    train_generator,
-    steps_per_epoch=nb_train_samples // batch_size,
+top_model.fit(
+    train_features,
+    train_labels,
+    batch_size=batch_size * accumulation_steps,
     epochs=3,
-    validation_data=validation_generator,
-    validation_steps=nb_validation_samples // batch_size)
+    validation_data=(validation_features, validation_labels))
 
 
 ## (5) Second training step: fine-tuning upper convolutional layers from InceptionV3
@@ -158,16 +177,16 @@ for layer in model.layers[249:]:
    layer.trainable = True
 
 # Recompile the model for these modifications to take effect. We use SGD with a low learning rate.
-from keras.optimizers import SGD
-model.compile(optimizer=SGD(lr=0.0001, momentum=0.9), loss='categorical_crossentropy', metrics=['accuracy'])
+from tensorflow.keras.optimizers import SGD
+# As above, the training step is compiled with XLA.
+model.compile(optimizer=SGD(learning_rate=0.0001, momentum=0.9), loss='sparse_categorical_crossentropy', metrics=['accuracy'],
+              jit_compile=True)
 
 # We train our model again (this time fine-tuning the top 2 inception blocks alongside the top Dense layers).
-model.fit_generator(
-    train_generator,
-    steps_per_epoch=nb_train_samples // batch_size,
+model.fit(
+    train_ds,
     epochs=30,
-    validation_data=validation_generator,
-    validation_steps=nb_validation_samples // batch_size)
+    validation_data=validation_ds)
 
 
 
@@ -1,16 +1,20 @@
 import cadquery as cq
 import cadquery.selectors as cqs
-import logging, importlib
+import logging, importlib, sys
 from types import SimpleNamespace as Measures
 from math import cos, radians
 import utilities # Local directory import.
 
-# Selective reloading to pick up changes made between script executions.
+# Selective reloading to pick up changes made between script executions. Only needed when running 
+# inside CQ-editor, elsewhere the module has just been imported anyway.
 # See: https://github.com/CadQuery/CQ-editor/issues/99#issue-525367146
-importlib.reload(utilities)
+if "cq_editor" in sys.modules: importlib.reload(utilities)
 
 log = logging.getLogger(__name__)
 
+# Ratio of the width across corners of a regular hexagon to its width across flats.
+hexagon_corners_per_flats = 1 / cos(radians(30))
+
 
 class BoltMount:
 
@@ -72,72 +76,34 @@ class BoltMount:
             .box(m.block.width, m.block.depth, m.block.height)
         )
 
-        # Create brackets in the positions specified.
-        # todo: Make this code more compact by avoiding the redundancy
+        # Create brackets in the positions specified. Each bracket is given as (position, face to 
+        # create it on, rotation of the workplane around its z axis, bracket width, fillet reduction).
+        #
+        # The OCCT CAD kernel cannot create fillets on adjacent sides of a cube that meet in one point 
+        # on their common edge. To prevent this, the left and right brackets will get a minimally 
+        # smaller fillet radius.
+        # todo: Once different measures can be used for all of the four brackets, the constructor has 
+        #   to make sure that the fillet measures are different between adjacent brackets.
+        brackets = [
+            ("top",    ">Z",   0, m.block.width,  0),
+            ("bottom", "<Z", 180, m.block.width,  0),
+            ("left",   "<X",  90, m.block.height, 0.01),
+            ("right",  ">X", 270, m.block.height, 0.01)
+        ]
+
+        for (position, face, rotate_z, width, fillet_reduction) in brackets:
+            if not getattr(m.brackets.positions, position): continue
 
-        if m.brackets.positions.top:
             self.model = (
                 self.model
-                .faces(">Z").edges(">Y").transformedWorkplane(centerOption = "CenterOfMass", rotate_z = 0)
-                .bracket(
-                    thickness = m.brackets.thickness, 
-                    height = m.brackets.height,
-                    width = m.block.width,
-                    holes_count = m.brackets.hole_count, 
-                    holes_diameter = m.brackets.hole_diameter,
-                    edge_fillet = m.brackets.fillet_radius,
-                    corner_fillet = min(m.block.width, m.brackets.height) / 4
-                )
-            )
-
-        if m.brackets.positions.bottom:
-            self.model = (
-                self.model
-                .faces("<Z").edges(">Y").transformedWorkplane(centerOption = "CenterOfMass", rotate_z = 180)
+                .faces(face).edges(">Y").transformedWorkplane(centerOption = "CenterOfMass", rotate_z = rotate_z)
                 .bracket(
                     thickness = m.brackets.thickness,
                     height = m.brackets.height,
-                    width = m.block.width,
+                    width = width,
                     holes_count = m.brackets.hole_count,
                     holes_diameter = m.brackets.hole_diameter,
-                    edge_fillet = m.brackets.fillet_radius,
-                    corner_fillet = min(m.block.width, m.brackets.height) / 4
-                )
-            )
-        
-        if m.brackets.positions.left:
-            self.model = (
-                self.model
-                .faces("<X").edges(">Y").transformedWorkplane(centerOption = "CenterOfMass", rotate_z = 90)
-                .bracket(
-                    thickness = m.brackets.thickness,
-                    height = m.brackets.height,
-                    width = m.block.height,
-                    hole_count = m.brackets.hole_count,
-                    hole_diameter = m.brackets.hole_diameter,
-                    # The OCCT CAD kernel cannot create fillets on adjacent sides of a cube that 
-                    # meet in one point on their common edge. To prevent this, the left and right 
-                    # brackets will get a minimally smaller fillet radius.
-                    # todo: Once different measures can be used for all of the four brackets, the 
-                    #   constructor has to make sure that the fillet measures are different between 
-                    #   adjacent brackets.
-                    edge_fillet = m.brackets.fillet_radius - 0.01,
-                    corner_fillet = min(m.block.width, m.brackets.height) / 4
-                )
-            )
-
-        if m.brackets.positions.right:
-            self.model = (
-                self.model
-                .faces(">X").edges(">Y").transformedWorkplane(centerOption = "CenterOfMass", rotate_z = 270)
-                .bracket(
-                    thickness = m.brackets.thickness,
-                    height = m.brackets.height,
-                    width = m.block.height,
-                    holes_count = m.brackets.hole_count,
-                    holes_diameter = m.brackets.hole_diameter,
-                    # See the creation of the left bracket why we have to deduct 0.01.
-                    edge_fillet = m.brackets.fillet_radius - 0.01,
+                    edge_fillet = m.brackets.fillet_radius - fillet_reduction,
                     corner_fillet = min(m.block.width, m.brackets.height) / 4
                 )
             )
@@ -150,21 +116,28 @@ class BoltMount:
             # from the edges to fillet.
             .edges("(not %CIRCLE) and (not >Y)")
             .fillet(m.outer_edge_radius)
-        
-            # Cut the bolt hole into the core part.
-            .faces("<Y")
-            .workplane(centerOption = "CenterOfBoundBox")
-            .hole(m.hole.diameter)
-
-            # Cut the hex bolt head into the core part, from a workplane on the other side of the part.
-            # TODO: Use dummy_bolt() from utilities.py instead of cutting bolt and bolthead separately.
-            .faces("<Y")
-            .workplane(centerOption = "CenterOfBoundBox", invert = True, offset = m.block.depth)
+        )
+
+        # Create the bolt hole and the hex bolt head as tools on a workplane on the bolt hole's end. 
+        # Its normal points out of the part, so both are extruded in negative direction.
+        # TODO: Use dummy_bolt() from utilities.py instead of creating bolt and bolthead separately.
+        bolt_end = self.model.faces("<Y").workplane(centerOption = "CenterOfBoundBox")
+        bolt_hole = (
+            bolt_end
+            .circle(m.hole.diameter / 2)
+            .extrude(-m.block.depth, combine = False)
+        )
+        bolt_head = (
+            bolt_end
+            .workplane(offset = -(m.block.depth - m.hole.head_depth))
             # TODO: Use nut_hole() from utilities.py instead of polygon().
-            .polygon(6, (m.hole.head_across_flats / 2) / cos(radians(30)) * 2)
-            .cutBlind(-m.hole.head_depth)
+            .polygon(6, m.hole.head_across_flats * hexagon_corners_per_flats)
+            .extrude(-m.hole.head_depth, combine = False)
         )
 
+        # Cut bolt hole and bolt head into the core part, both at once.
+        self.model = self.model.cut(cq.Compound.makeCompound([bolt_hole.val(), bolt_head.val()]))
+
 
 # =============================================================================
 # Part Creation
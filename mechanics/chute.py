@@ -1,22 +1,27 @@
 import logging
 import importlib
-from math import sqrt, asin, degrees
+import sys
+from math import hypot, asin, degrees
 
 import cadquery as cq
-from cadquery import selectors
 
 # Local directory imports.
 
-# Selective reloading to pick up changes made between script executions.
+# Selective reloading to pick up changes made between script executions. Only needed when running 
+# inside CQ-editor, elsewhere the modules have just been imported anyway.
 # See: https://github.com/CadQuery/CQ-editor/issues/99#issue-525367146
 import utilities
 import fdm_stud
-importlib.reload(utilities)
-importlib.reload(fdm_stud)
+if "cq_editor" in sys.modules:
+    importlib.reload(utilities)
+    importlib.reload(fdm_stud)
 
 # In addition to importing whole packages as neededfor importlib.reload(), import some names.
 from utilities import sagittaArcOrLine
-from fdm_stud import fdmStud
+from fdm_stud import FdmStud
+
+# Register the CadQuery plugins needed for building the model, once when importing this module.
+cq.Workplane.uProfile = utilities.uProfile
 
 
 class Chute:
@@ -104,93 +109,143 @@ class Chute:
         
         self.model = workplane
 
-        # Save directly specified measures.
-        self.h = float(measures["h"])
-        self.d = float(measures["d"])
-        self.wall_thickness = float(measures["wall_thickness"])
-        self.upper_w = float(measures["upper_w"])
-        self.lower_w = float(measures["lower_w"])
-        self.lower_straight_wall_h = float(measures["lower_straight_wall_h"])
-        self.lower_rounded_wall_h = float(measures["lower_rounded_wall_h"])
-        self.upper_straight_wall_h = float(measures["upper_straight_wall_h"])
-        self.upper_rounded_wall_h = float(measures["upper_rounded_wall_h"])
+        # Save directly specified measures. All are numbers, except for the stud positions.
+        for name in (
+            "h", "d", "wall_thickness", "upper_w", "lower_w", 
+            "lower_straight_wall_h", "lower_rounded_wall_h", 
+            "upper_straight_wall_h", "upper_rounded_wall_h", 
+            "left_wall_distance", "right_wall_distance"
+        ):
+            setattr(self, name, float(measures[name]))
         self.left_studs = measures["left_studs"]
-        self.left_wall_distance = float(measures["left_wall_distance"])
         self.right_studs = measures["right_studs"]
-        self.right_wall_distance = float(measures["right_wall_distance"])
         
         # Calculate derived measures.
         self.w = max(self.upper_w, self.lower_w)
+        self.slide_length = hypot(self.d, self.h)
+        # Drop angle at entry to the chute, same as exit angle.
+        self.slide_angle = degrees(asin(self.h / self.slide_length))
         
         # Adjust the wall mount distances to count from the center plane.
         self.left_wall_distance = self.left_wall_distance + self.w / 2
         self.right_wall_distance = self.right_wall_distance + self.w / 2
         
-        # Register imported CadQuery plugins needed for building the model.
-        cq.Workplane.fdmStud = fdmStud
-        
         self.build()
 
 
-    def build(self):
-        cq.Workplane.uProfile = utilities.uProfile
-        slide_length = sqrt(self.d * self.d + self.h * self.h)
-        # Drop angle at entry to the chute, same as exit angle.
-        slide_angle = degrees(asin(self.h / slide_length))
-        
-        # Create wires for the lower and upper profile independently, while no other pending wire is 
-        # present. Because offset2D() used in uProfile() will affect all pending wires at the same 
-        # time. See: https://github.com/CadQuery/cadquery/issues/570
-        lower_profile = cq.Workplane("XY").uProfile(
-            w = self.lower_w, 
-            straight_h = self.lower_straight_wall_h, 
-            rounded_h = self.lower_rounded_wall_h, 
+    def build_profile(self, w, straight_h, rounded_h):
+        """
+        Create the wires of a U profile of the chute, on the XY plane.
+
+        :param w: Outer width of the profile. See uProfile() for all parameters.
+        :return: A tuple of the wires, to be added to the pending wires of a workplane.
+        """
+        # Create the wires while no other pending wire is present. Because offset2D() used in 
+        # uProfile() will affect all pending wires at the same time. 
+        # See: https://github.com/CadQuery/cadquery/issues/570
+        profile = cq.Workplane("XY").uProfile(
+            w = w, 
+            straight_h = straight_h, 
+            rounded_h = rounded_h, 
             wall_thickness = self.wall_thickness
         )
-        upper_profile = cq.Workplane("XY").transformed(offset = (0,0,slide_length)).uProfile(
-            w = self.upper_w, 
-            straight_h = self.upper_straight_wall_h, 
-            rounded_h = self.upper_rounded_wall_h, 
-            wall_thickness = self.wall_thickness
+        return tuple(profile.ctx.pendingWires)
+
+
+    def build_stud(self, height):
+        """
+        Create a wall mount stud on the XY plane. All studs of one side of the chute are the same, 
+        so build() builds one per side and places copies of it.
+
+        :param height: Height of the stud, reaching from the wall through the chute.
+        :return: The stud solid.
+        """
+        return FdmStud(cq.Workplane("XY"), {"radius": 4, "height": height}).model.val()
+
+
+    def trim_studs(self, studs, face_plane):
+        """
+        Cut off the parts of studs that reach into the chute, with one cut for all of them.
+
+        :param studs: List of stud solids, all attached to the same side face of the chute.
+        :param face_plane: Workplane on that side face, with its normal pointing out of the chute.
+        :return: A list with one compound of the cut studs, or an empty list if there are no studs.
+        """
+        if not studs:
+            return []
+
+        # Cut with a box covering all of the half-space behind the side face, as far as the studs 
+        # reach. Same as Workplane::split(keepTop = True) does, but without creating the box for 
+        # the other half and without a workplane. The box is centered on the studs as projected 
+        # onto the face, as they can be far away from the face plane's origin on a long chute.
+        studs = cq.Compound.makeCompound(studs)
+        bounding_box = studs.BoundingBox()
+        size = 2 * bounding_box.DiagonalLength
+        center = face_plane.plane.toLocalCoords(bounding_box.center)
+        half_space = (
+            cq.Solid
+            .makeBox(size, size, size, pnt = cq.Vector(center.x - size / 2, center.y - size / 2, -size))
+            .moved(cq.Location(face_plane.plane))
         )
-        self.model.ctx.pendingWires.extend(lower_profile.ctx.pendingWires)
-        self.model.ctx.pendingWires.extend(upper_profile.ctx.pendingWires)
+        return [studs.cut(half_space)]
+
+
+    def build(self):
+        # Create wires for the lower and upper profile independently, and place the upper one at 
+        # the other end of the chute.
+        lower_profile = self.build_profile(
+            self.lower_w, self.lower_straight_wall_h, self.lower_rounded_wall_h
+        )
+        upper_profile = self.build_profile(
+            self.upper_w, self.upper_straight_wall_h, self.upper_rounded_wall_h
+        )
+        upper_location = cq.Location(cq.Vector(0, 0, self.slide_length))
+        upper_profile = [wire.moved(upper_location) for wire in upper_profile]
         
-        # Create the basic chute solid.
-        self.model = self.model.loft(combine = True)
+        # Create the basic chute solid. Lofted directly from the wires, as with Workplane::loft() 
+        # they would first have to be added to the model's pending wires.
+        chute = cq.Solid.makeLoft([*lower_profile, *upper_profile]).clean()
+        self.model = self.model.newObject([chute])
         
-        # Attach wall mount studs to the left side face.
+        # Create wall mount studs for the left side face. All studs are collected first and attached 
+        # with a single union at the end, as each union has to process the whole chute again.
+        left_studs = []
         left_case_plane = cq.Workplane("YZ").workplane(offset = -self.left_wall_distance)
         left_face_plane = self.model.faces("<X").workplane()
+        left_stud = self.build_stud(self.left_wall_distance + self.w)
+        # Place each stud by shifting one shared location within the case plane, instead of 
+        # deriving a new workplane for each stud. Shifts are along the unrotated plane's axes, as 
+        # with Workplane::center() before Workplane::transformed().
+        left_plane = left_case_plane.plane
+        left_location = cq.Location(left_case_plane.transformed(rotate = (0,0,180)).plane)
         for stud_pos in self.left_studs:
-            a_stud = (
-                left_case_plane
-                .center(-stud_pos[0], stud_pos[1])
-                .transformed(rotate = (0,0,180))
-                .fdmStud({"radius": 4, "height": self.left_wall_distance + self.w})
-                .copyWorkplane(left_face_plane)
-                .split(keepTop = True)
-            )
-            self.model = self.model.union(a_stud, glue = True)
+            shift = left_plane.xDir * -stud_pos[0] + left_plane.yDir * stud_pos[1]
+            left_studs.append(left_stud.moved(cq.Location(shift) * left_location))
         
-        # Attach wall mount studs to the right side face. Note that workplane offsets are in the 
+        # Create wall mount studs for the right side face. Note that workplane offsets are in the 
         # workplane's local z coordinates, which are reversed by invert = True.
         right_case_plane = (
             cq.Workplane("YZ").workplane(offset = -self.right_wall_distance, invert = True)
         )
         right_face_plane = self.model.faces(">X").workplane()
+        right_studs = []
+        right_stud = self.build_stud(self.right_wall_distance + self.w)
+        right_plane = right_case_plane.plane
+        right_location = cq.Location(right_plane)
         for stud_pos in self.right_studs:
-            a_stud = (
-                right_case_plane
-                .center(-stud_pos[0], -stud_pos[1])
-                .fdmStud({"radius": 4, "height": self.right_wall_distance + self.w})
-                .copyWorkplane(right_face_plane)
-                .split(keepTop = True)
-            )
-            self.model = self.model.union(a_stud, glue = True)
+            shift = right_plane.xDir * -stud_pos[0] + right_plane.yDir * -stud_pos[1]
+            right_studs.append(right_stud.moved(cq.Location(shift) * right_location))
+
+        # Attach all studs to the chute, after cutting off their parts inside the chute.
+        studs = (
+            self.trim_studs(left_studs, left_face_plane) + 
+            self.trim_studs(right_studs, right_face_plane)
+        )
+        if studs:
+            self.model = self.model.union(cq.Compound.makeCompound(studs), glue = True)
     
         # Rotate the chute as needed.
-        self.model = self.model.rotate((-1,0,0), (1,0,0), 90 - slide_angle)
+        self.model = self.model.rotate((-1,0,0), (1,0,0), 90 - self.slide_angle)
         
         # Cut off the lower chute end horizontally (along the XY plane). Workplanes are not rotated 
         # when rotating the object, so we can use the original baseplane without needing a 
@@ -1,18 +1,39 @@
-import logging
 import importlib
 import math
-from math import sqrt, asin, degrees
+import sys
+from functools import cached_property
 
 import cadquery as cq
-from cadquery import selectors
 
 import utilities
-importlib.reload(utilities)
+# reload to pick up changes to utilities between script executions in CQ-editor.
+# Not needed elsewhere, where it has just been imported anyway.
+if "cq_editor" in sys.modules: importlib.reload(utilities)
 
 
 # In addition to importing whole packages as neededfor importlib.reload(), import some names.
 
 class ConveyorUnit:
+    # metric nut sizes (width across flats) and thicknesses, by bolt size (DIN)
+    m_nuts = {
+        3  : (6.1,2.4),
+        4  : (7.7,3.2),
+        5  : (8.8,4.0),
+        6  : (11.1,5.0),
+        8  : (14.4,6.5),
+        10 : (18.9,8.0)
+    }
+
+    # the parts that make up the conveyor unit
+    part_names = ["belt_bracket_motor", "belt_bracket_roller", "motor_roller", "other_roller",
+                  "axis_connector_left", "axis_connector_right"]
+
+    # tessellation tolerances for STL export: linear deviation in mm and angular deviation in radians.
+    # The parts are plates and cylinders a few cm in size, for which an angular tolerance coarser than
+    # CadQuery's default of 0.1 gives far fewer triangles without a visible difference.
+    stl_tolerance         = 0.1
+    stl_angular_tolerance = 0.3
+
     def __init__ (self,workplane,measures):
         """
          :param measures : measurement of the bracket:
@@ -24,20 +45,8 @@ class ConveyorUnit:
              din : bolt size for connection halves and mounting
         """
         
-        self.belt_bracket_motor   = cq.Workplane("XY")
-        self.belt_bracket_roller  = cq.Workplane("XY")
-        self.motor_roller         = cq.Workplane("XY")
-        self.other_roller         = cq.Workplane("XY")
-        self.tensioner_left       = cq.Workplane("XY")
-        self.tensioner_right      = cq.Workplane("XY")
-        self.axis_connector_left  = cq.Workplane("XY")
-        self.axis_connector_right = cq.Workplane("XY")
         self.model = workplane
 
-        self.m_din = (3,4,5,6,8,10)
-        self.m_nut_size      = (6.1,7.7,8.8,11.1,14.4,18.9)
-        self.m_nut_thickness = (2.4,3.2,4.0, 5.0,6.5,8.0)
-
         self.bw   = float(measures["belt_width"])
         self.bh   = float(measures["bracket_height"])
         self.bl   = float(measures["bracket_length"])/2
@@ -62,169 +71,180 @@ class ConveyorUnit:
         self.rl   = self.bw + 2*self.rbew  # length or a roller
         self.bwi  = self.rl + 2*self.rg    # inner width of bracket
         self.nsp  = 0.2 # space around nut as % of nut size
+        self.ap   = self.bl - self.bh/2    # position of the roller axes
         
 
-        if (self.td in self.m_din):
-           self.ns = self.m_nut_size[self.m_din.index(self.td)]
-           self.nt = self.m_nut_thickness[self.m_din.index(self.td)]
+        if (self.td in self.m_nuts):
+           self.ns, self.nt = self.m_nuts[self.td]
            self.tp = self.bl - self.asd - self.ad        #position of the tensioner
            self.ts = 2*self.nt + (2*self.nsp+1)*self.ns  #size (in belt direction) of tensioner           
-           self.build()
+        else:
+           # the parts cannot be built without a known nut size, so use empty ones
+           self.belt_bracket_motor   = cq.Workplane("XY")
+           self.belt_bracket_roller  = cq.Workplane("XY")
+           self.motor_roller         = cq.Workplane("XY")
+           self.other_roller         = cq.Workplane("XY")
+           self.tensioner_left       = cq.Workplane("XY")
+           self.tensioner_right      = cq.Workplane("XY")
+           self.axis_connector_left  = cq.Workplane("XY")
+           self.axis_connector_right = cq.Workplane("XY")
+
+    # build the plain side plate, which is the same for both bracket halves
+    def build_side_plate(self):
+        hw = self.bh/2  # half width of the side plate
 
-    def build_side(self,name,purpose):
-        offset = self.bwi/2
-        sign = 1
-        if name == "left" : sign = -1 
-        
         #bracket side plane
         side = cq.Workplane("XZ")\
-            .moveTo(-self.bh/2,self.bl-self.bh/2)\
-            .sagittaArc((self.bh/2,self.bl-self.bh/2),self.bh/2)\
-            .lineTo(self.bh/2,0)\
-            .lineTo(-self.bh/2,0)\
+            .moveTo(-hw,self.ap)\
+            .sagittaArc((hw,self.ap),hw)\
+            .lineTo(hw,0)\
+            .lineTo(-hw,0)\
             .close()
 
         #extrude if over material thickness
-        side = side.extrude(-sign*self.mtb)
+        side = side.extrude(-self.mtb)
 
         #cut hole for mounting
         side = side.faces(">Y").workplane()\
             .moveTo(0,(self.tp-self.ts-2*self.din))\
             .hole(self.din)
 
+        return(side)
+
+    # build the right side of a bracket half from the plain side plate.
+    # The left side is its mirror image, as all features are symmetric in X-direction.
+    def build_side(self,side,purpose):
+        offset = self.bwi/2
+        br = self.bd/2  # bearing radius
+        ar = self.ad/2  # axis radius
+
         if (purpose == "motor"):
-        # 1) cut hole for bearing
-        # 2) from the outside extrude cilinder bearing diameter - bracket material thickness
-        # 3) cut out hole for bearing
-        # 4) from outide put the "lid" on
-        # 5) cut hole in lid twice the axis diameter
+        # 1) from the outside add a cylinder of bearing diameter + material thickness,
+        #    reaching from the plate over the bearing thickness, plus material thickness for the "lid"
+        # 2) cut out the hole for the bearing through plate and cylinder
+        # 3) cut a hole in the lid of twice the axis diameter
+        # All of this is done with cylinders around the bearing axis and just one union and one cut.
+            axis_pos = cq.Vector(0,0,self.ap)
+            axis_dir = cq.Vector(0,1,0)
+            bearing_case = cq.Solid.makeCylinder(br+self.mto, self.bt-self.mtb+self.mto,
+                axis_pos.add(cq.Vector(0,self.mtb,0)), axis_dir)
+            bearing_hole = cq.Solid.makeCylinder(br, self.bt, axis_pos, axis_dir)
+            lid_hole     = cq.Solid.makeCylinder(self.ad, self.bt+self.mto, axis_pos, axis_dir)
             side = side\
-                .moveTo(0,self.bl-self.bh/2)\
-                .circle(self.bd/2)\
-                .cutThruAll()\
-                .faces(">Y").workplane()\
-                .moveTo(0,self.bl-self.bh/2)\
-                .circle(self.bd/2+self.mto)\
-                .extrude(self.bt-self.mtb)\
-                .faces(">Y").workplane()\
-                .moveTo(0,self.bl-self.bh/2)\
-                .circle(self.bd/2)\
-                .cutThruAll()\
-                .moveTo(0,self.bl-self.bh/2)\
-                .circle(self.bd/2+self.mto)\
-                .extrude(self.mto)\
-                .faces(">Y").workplane()\
-                .moveTo(0,self.bl-self.bh/2)\
-                .circle(self.ad)\
-                .cutThruAll()\
+                .newObject([side.findSolid().fuse(bearing_case).cut(bearing_hole,lid_hole).clean()])\
                 .rotate((0,-1,0),(0,1,0),180)
 
 
         else:
-            side = side.faces(">Y").workplane()\
-                .moveTo(-self.ad/2,self.bl)\
-                .line(0,-self.asd+self.ad/2)\
-                .sagittaArc((self.ad/2,self.bl-self.asd+self.ad/2),-self.ad/2)\
-                .line(0,self.asd-self.ad/2)\
+            # side is still on the workplane of its ">Y" face, so no need to select that again
+            side = side\
+                .moveTo(-ar,self.bl)\
+                .line(0,-self.asd+ar)\
+                .sagittaArc((ar,self.bl-self.asd+ar),-ar)\
+                .line(0,self.asd-ar)\
                 .close()\
                 .cutThruAll()
                 
-        #rotate along its axis if it's the left half
-        if (name == "left"):
-            side = side.rotate((0,-self.mtb/2,1),(0,-self.mtb/2,-1),180)
-        
         #translate it over half belt width to center bracket
-        side = side.translate((0,sign*offset,0))
+        side = side.translate((0,offset,0))
         
        
         return(side)
 
-    #build the little block on the side for the belt tensioning bolt
-    def build_tensioner(self,name):
+    #build the little block on the left side for the belt tensioning bolt.
+    #The one on the right side is the same block, rotated 180 degrees around the Z axis.
+    def build_tensioner(self):
         #1) draw the side surface in YZ plane
         #2) extrude it into X-direction
         #3) get the top surface
         #   a) create the round hole for the screw
         #   b) creat 6-sides hole for the nut to fit in
+        nw = (2*self.nsp+1)*self.ns   # width of the nut with space around it
+        nc = (0.5+self.nsp)*self.ns   # distance from side to center of the nut
         adjuster = cq.Workplane("YZ")\
-            .moveTo(-(2*self.nsp+1)*self.ns,0)\
-            .line((2*self.nsp+1)*self.ns,0)\
-            .line(0,-self.ts)\
-            .line(-(2*self.nsp+1)*self.ns,(2*self.nsp+1)*self.ns)\
+            .polyline([(-nw,0),(0,0),(0,-self.ts),(-nw,nw-self.ts)])\
             .close()\
-            .extrude(-(1+2*self.nsp)*self.ns)\
+            .extrude(-nw)\
             .faces(">Z").workplane()\
-            .moveTo(-(0.5+self.nsp)*self.ns,-(0.5+self.nsp)*self.ns)\
+            .moveTo(-nc,-nc)\
             .polygon(6,self.ns)\
             .hole(self.td)\
             .cutBlind(-self.nt)
-        #left side : translate if from origina to position
-        #righ side : rotate it 180 degrees, then translate it
-        if (name == "left"):
-            adjuster = adjuster\
-                .translate(((0.5+self.nsp)*self.ns,-self.bw/2-self.mtb,self.tp))
-        elif (name == "right"):
-            adjuster = adjuster\
-                .rotate((0,0,-1),(0,0,1),180)\
-                .translate((-(0.5+self.nsp)*self.ns,self.bw/2+self.mtb,self.tp))            
+        #translate it from origin to position
+        adjuster = adjuster\
+            .translate((nc,-self.bw/2-self.mtb,self.tp))
         return(adjuster)
        
-    # build the plate on the top side of the belt bracket on which the belt rests
-    def build_belt_rest(self,purpose):
-        # 1) reate cross section in XY plane
-        # 2) extrude in z-direction 
-        sign = 1
-        if (purpose != "motor"):
-            sign = -1 ;
+    # build the plate on the top side of the belt bracket on which the belt rests.
+    # This is the one of the motor half, the one of the other half is its mirror image.
+    def build_belt_rest(self):
+        # it's a plain box, so create it directly instead of drawing
+        # the cross section in XY plane and extruding it in z-direction
+        length = self.bl - self.bh - self.rbeh
         return(cq.Workplane("XY")\
-            .moveTo(-self.bh/2,-self.bwi/2)\
-            .line(self.mtb,0)\
-            .line(0,self.bwi)\
-            .line(-self.mtb,0)\
-            .close()\
-            .extrude(-sign*(self.bl - self.bh - self.rbeh))
+            .add(cq.Solid.makeBox(self.mtb,self.bwi,length,
+                pnt=cq.Vector(-self.bh/2,-self.bwi/2,-length)))
             )
             
-    # build the plate to connect the 2 bracket halves
-    def build_connector(self,purpose):
-        #1) create the plate in XY plane
-        #2) extrude over material thickness in Z-direction
-        #3) create 3 holes for connection
-        sign = 1
-        if (purpose != "motor"):
-            sign = -1 ;        
+    # build the plate to connect the 2 bracket halves.
+    # This is the one of the motor half, the one of the other half is its mirror image.
+    def build_connector(self):
+        #1) create the plate as a box below the XY plane
+        #2) create 3 holes for connection from its top side, which is in the XY plane, all in one cut
         return(cq.Workplane("XY")\
-            .moveTo(self.bh/2,self.bwi/2)\
-            .line(-self.bh+self.mtb,0)\
-            .line(0,-self.bwi)\
-            .line(self.bh-self.mtb,0)\
-            .close()\
-            .extrude(-sign*self.mtb)\
-            .faces(">Z").workplane()\
-            .moveTo(self.mtb/2,0)\
-            .hole(self.din)\
-            .moveTo(self.mtb/2,-self.bwi/4)\
-            .hole(self.din)\
-            .moveTo(self.mtb/2,self.bwi/4)\
+            .add(cq.Solid.makeBox(self.bh-self.mtb,self.bwi,self.mtb,
+                pnt=cq.Vector(-self.bh/2+self.mtb,-self.bwi/2,-self.mtb)))\
+            .pushPoints([(self.mtb/2,0),(self.mtb/2,-self.bwi/4),(self.mtb/2,self.bwi/4)])\
             .hole(self.din)
             )
 
-    #build the belt rollers
-    def build_roller(self,purpose):
+    # get a workplane on the top (">Z") or bottom ("<Z") end of a roller, with the roller as parent.
+    # Same as roll.faces(end).workplane(), but as both ends are known, without searching the faces.
+    def roller_end(self,roll,end):
+        if (end == ">Z"):
+            plane = cq.Plane(origin=(0,0,self.rl), xDir=(1,0,0), normal=(0,0,1))
+        else:
+            plane = cq.Plane(origin=(0,0,0), xDir=(1,0,0), normal=(0,0,-1))
+        return(roll.copyWorkplane(cq.Workplane(plane)))
+
+    # cut round recesses of the given radius and depths into both ends of a roller, in one cut
+    def cut_roller_ends(self,roll,radius,top_depth,bottom_depth):
+        top    = cq.Solid.makeCylinder(radius, top_depth, cq.Vector(0,0,self.rl-top_depth))
+        bottom = cq.Solid.makeCylinder(radius, bottom_depth)
+        return(roll.newObject([roll.findSolid().cut(top,bottom).clean()]))
+
+    #build the part of the belt rollers that is the same for both rollers
+    def build_roller_body(self):
+        rr = self.rd/2  # roller radius
+
         # start with just vertical cyliner
-        roll = cq.Workplane("XY")\
-            .circle(self.rd/2)\
-            .extrude(self.rl)
+        roll = cq.Solid.makeCylinder(rr,self.rl)
         
-        # make ridges on the rollers to guide the belt
+        # make ridges on the rollers to guide the belt, as wider cylinders at both ends
+        # which are added in one union
         if (self.rbeh > 0) & (self.rbew > 0):
-            roll = roll\
-                .faces("<Z").workplane()\
-                .circle(self.rd/2+self.rbeh)\
-                .extrude(-self.rbeh)\
-                .faces(">Z").workplane()\
-                .circle(self.rd/2+self.rbeh)\
-                .extrude(-self.rbeh)            
+            ridge_bottom = cq.Solid.makeCylinder(rr+self.rbeh,self.rbeh)
+            ridge_top    = cq.Solid.makeCylinder(rr+self.rbeh,self.rbeh,cq.Vector(0,0,self.rl-self.rbeh))
+            roll = roll.fuse(ridge_bottom,ridge_top).clean()
+
+        roll = cq.Workplane("XY").add(roll)
+
+        # cut the hole from the other side than the motor axis hole
+        # just round, to fit in an axis
+        roll = self.roller_end(roll,"<Z")\
+            .circle(self.ad/2)\
+            .cutBlind(-(self.rl-self.mal-2*self.rg)) 
+
+
+       # if an anti-friction edge is wanted, emboss the roller ends 1 mm
+        if (self.fe > 0):
+            roll = self.cut_roller_ends(roll,rr-2,self.fe,1)
+                
+        return(roll)
+
+    #build a belt roller from the roller body
+    def build_roller(self,roll,purpose):
+        mar1 = self.mad1/2  # major motor axis radius
 
         # if it's the motor roller and the motor has
         # an axis that is not round we should make
@@ -234,18 +254,19 @@ class ConveyorUnit:
         if (purpose == "motor"):
             if (self.mae == 0):
             # it's a motor with a round axis
-                self.roll = self.roll.faces(">Z").workplane(offset=-self.mal)\
-                    .circle(self.mad1/2)\
+                roll = self.roller_end(roll,">Z").workplane(offset=-self.mal)\
+                    .circle(mar1)\
                     .cutBlind(self.mal)
             elif (self.mae == 1):
             # define the axis hole as flat part + 3-point arc
             # cut the whole over the motor axis length (mal)
-                mar2 = self.mad2 - 0.5*self.mad1
-                lFlat = math.sqrt(0.25*self.mad1**2 - mar2**2)
+                mar2 = self.mad2 - mar1
+                # half the length of the flat part, as sqrt(a²-b²) factored for precision
+                lFlat = math.sqrt((mar1-mar2)*(mar1+mar2))
                 endPoint = (-lFlat,mar2)
-                midPoint = (0,-self.mad1/2)
-                self.roll = self.roll.faces(">Z").workplane()\
-                    .moveTo(endPoint[0],endPoint[1])\
+                midPoint = (0,-mar1)
+                roll = self.roller_end(roll,">Z")\
+                    .moveTo(*endPoint)\
                     .line(2*lFlat,0)\
                     .threePointArc(midPoint,endPoint)\
                     .close()\
@@ -255,144 +276,213 @@ class ConveyorUnit:
               # three point arc, flat part, three point arc and close
               # cut the hole over the motor axis length (mal)
                 mar2 = self.mad2/2 
-                lFlat = math.sqrt(0.25*(self.mad1**2 - self.mad2**2))
+                lFlat = math.sqrt((mar1-mar2)*(mar1+mar2))
                 points = [(-mar2,lFlat),
-                          (0,self.mad1/2),
+                          (0,mar1),
                           (mar2,lFlat),
                           (mar2,-lFlat),
-                          (0,-self.mad1/2),
+                          (0,-mar1),
                           (-mar2,-lFlat)]
-                roll = roll.faces(">Z").workplane()\
-                    .moveTo(points[0][0],points[0][1])\
+                roll = self.roller_end(roll,">Z")\
+                    .moveTo(*points[0])\
                     .threePointArc(points[1],points[2])\
-                    .lineTo(points[3][0],points[3][1])\
+                    .lineTo(*points[3])\
                     .threePointArc(points[4],points[5])\
                     .close()\
                     .cutBlind(-self.mal)
         else:
             # it's the non-motor roller, henace it should have
             # a big hole to avoid the axis touching the roll
-            roll = roll.faces(">Z").workplane(offset=-self.mal)\
+            roll = self.roller_end(roll,">Z").workplane(offset=-self.mal)\
                 .circle(self.mad1)\
                 .cutBlind(self.mal)
                 
            # if bearing diameter and bearing thickness > 0
            # space should be made to fit a bearing in the roller ends
             if (self.bd > 0) & (self.bt > 0):
-               roll = roll.faces(">Z").workplane()\
-                    .circle(self.bd/2)\
-                    .cutBlind(-self.bt)\
-                    .faces("<Z").workplane()\
-                    .circle(self.bd/2)\
-                    .cutBlind(-self.bt)
-
+               roll = self.cut_roller_ends(roll,self.bd/2,self.bt,self.bt)
 
-        # cut the remaing hole from the other side
-        # just round, to fit in an axis
-        roll = roll.faces("<Z").workplane()\
-            .circle(self.ad/2)\
-            .cutBlind(-(self.rl-self.mal-2*self.rg)) 
-
-
-       # if an anti-friction edge is wanted, emboss the roller ends 1 mm
-        if (self.fe > 0):
-            roll = roll.faces(">Z").workplane()\
-                .circle(self.rd/2-2)\
-                .cutBlind(-self.fe)\
-                .faces("<Z").workplane()\
-                .circle(self.rd/2-2)\
-                .cutBlind(-1)    
-                
         return(roll)
 
     # build the connection piece for belt tensioning bolt and axis
     def build_tensioner_axis_connector(self):
         side_length = self.ad/2 + self.mto + self.td
+        side_pos = cq.Vector(0,0,self.td)
+        side_dir = cq.Vector(1,0,0)
 
         # the sold cilinder that fits over the axis
-        maincyl = cq.Workplane("XY")\
-            .circle(self.ad/2+self.mto)\
-            .extrude(self.td*2)
+        maincyl = cq.Solid.makeCylinder(self.ad/2+self.mto, self.td*2)
 
         #the solid cilinder that fits over the tensioning bold
-        sidecyl = cq.Workplane("YZ")\
-            .moveTo(0,self.td)\
-            .circle(self.td/2+self.mto)\
-            .extrude(side_length)
-        
-        # now combine the 2 solid cylinbers and cut the holes
-        # first the axis hole through and through
+        sidecyl = cq.Solid.makeCylinder(self.td/2+self.mto, side_length, side_pos, side_dir)
+
+        # the holes, cut from both cylinders together:
+        # first the axis hole through and through (the side cylinder never reaches further
+        # than material thickness beyond the main cylinder's ends),
         # second the tensioner hole from the center of the axis outwards
-        connector = cq.Workplane("YZ")\
-            .union(maincyl)\
-            .union(sidecyl)\
-            .faces("<Z").workplane()\
-            .circle(self.ad/2)\
-            .cutThruAll()\
-            .faces(">X").workplane()\
-            .moveTo(0,self.td)\
-            .circle(self.td/2)\
-            .cutBlind(-side_length)
+        axis_hole      = cq.Solid.makeCylinder(self.ad/2, self.td*2+self.mto*2, cq.Vector(0,0,-self.mto))
+        tensioner_hole = cq.Solid.makeCylinder(self.td/2, side_length, side_pos, side_dir)
+
+        # now combine the 2 solid cylinders and cut the holes, with one union and one cut
+        connector = cq.Workplane("XY")\
+            .add(maincyl.fuse(sidecyl).cut(axis_hole,tensioner_hole).clean())
         return(connector)
 
     
+    # move a part into place by rotating it around the given axes, one after the other, and then
+    # translating it. Rotations are (axis start point, axis end point, angle) as for Workplane.rotate().
+    # All steps are combined into one location, so unlike with Workplane.rotate() and .translate(),
+    # the part's geometry is not copied and transformed for every step.
+    def place(self,part,rotations,translation):
+        location = cq.Location()
+        for (start,end,angle) in rotations:
+            start = cq.Vector(start)
+            axis  = cq.Vector(end).sub(start)
+            rotation = cq.Location(start) * cq.Location(cq.Vector(),axis,angle) * cq.Location(start.multiply(-1))
+            location = rotation * location
+        location = cq.Location(cq.Vector(translation)) * location
+
+        return(part.newObject([part.val().moved(location)]))
+
+    # The parts of the model. Each is built when it is first used, so that
+    # nothing is built that is not needed.
+
+    # parts that other parts are built from
+    @cached_property
+    def side_plate(self):
+        return(self.build_side_plate())
+
+    @cached_property
+    def roller_body(self):
+        return(self.build_roller_body())
+
+    @cached_property
+    def axis_connector(self):
+        return(self.build_tensioner_axis_connector())
+
+    # build the motor half of the bracket from its pieces
+    # and combine the pieces into one.
+    # Left and right sides are mirror images of each other, so build
+    # only the right ones and mirror them.
+    @cached_property
+    def right_plate_motor(self):
+        return(self.build_side(self.side_plate,"motor"))
+
+    @cached_property
+    def left_plate_motor(self):
+        return(self.right_plate_motor.mirror("XZ"))
+
+    @cached_property
+    def belt_rest_motor(self):
+        return(self.build_belt_rest())
+
+    @cached_property
+    def connector_motor(self):
+        return(self.build_connector())
+
+    @cached_property
+    def belt_bracket_motor(self):
+        return(self.left_plate_motor\
+            .union_all(
+                self.right_plate_motor,
+                self.belt_rest_motor,
+                self.connector_motor))
+
+    # build the other half of the bracket from its pieces
+    # and combine the pieces into one.
+    # Belt rest and connector are mirror images of the ones of the motor half.
+    @cached_property
+    def right_plate_roller(self):
+        return(self.build_side(self.side_plate,"roller"))
+
+    @cached_property
+    def left_plate_roller(self):
+        return(self.right_plate_roller.mirror("XZ"))
+
+    @cached_property
+    def belt_rest_roller(self):
+        return(self.belt_rest_motor.mirror("XY"))
+
+    @cached_property
+    def connector_roller(self):
+        return(self.connector_motor.mirror("XY"))
+
+    @cached_property
+    def tensioner_left(self):
+        return(self.build_tensioner())
+
+    @cached_property
+    def tensioner_right(self):
+        return(self.tensioner_left.rotate((0,0,-1),(0,0,1),180))
+
+    @cached_property
+    def belt_bracket_roller(self):
+        return(self.left_plate_roller\
+            .union_all(
+                self.right_plate_roller,
+                self.belt_rest_roller,
+                self.connector_roller,
+                self.tensioner_left,
+                self.tensioner_right))
+
+    # create the roller on the motor side of the bracket
+    # it will by default be in the XY plane in Z-direction
+    # so it hsa to be rotated and translated in place            
+    @cached_property
+    def motor_roller(self):
+        return(self.place(self.build_roller(self.roller_body,"motor"),
+            [((-1,0,self.rl/2),(1,0,self.rl/2),-90)],
+            (0,0,-self.ap-self.rl/2)))
+
+    #same for the other rolder 
+    @cached_property
+    def other_roller(self):
+        return(self.place(self.build_roller(self.roller_body,"roller"),
+            [((-1,0,self.rl/2),(1,0,self.rl/2),90)],
+            (0,0,self.ap-self.rl/2+5)))
+
+    # create the axis - belt tensioner connectors 
+    # and rotate and translate them into place.
+    # Both are the same part, so it is built only once. Rotating and
+    # translating return new objects and leave the part itself unchanged.
+    @cached_property
+    def axis_connector_left(self):
+        return(self.place(self.axis_connector,
+            [((0,-1,0),(0,1,0),90), ((0,0,-1),(0,0,1),90)],
+            (0,-self.bw/2-self.mtb-2*self.td-self.nsp*self.ns,self.ap+5)))
+
+    @cached_property
+    def axis_connector_right(self):
+        return(self.place(self.axis_connector,
+            [((0,-1,0),(0,1,0),90), ((0,0,-1),(0,0,1),90)],
+            (0,self.bw/2+self.mtb+self.nsp*self.ns,self.ap+5)))
+
+    # all output parts in one compound, to export them into a single STEP file.
+    # The parts are separate solids, so they are just collected, without any boolean operations.
+    @cached_property
+    def compound(self):
+        parts = [getattr(self,name) for name in self.part_names]
+        return(cq.Workplane("XY")\
+            .add(cq.Compound.makeCompound([shape for part in parts for shape in part.vals()]))
+            )
+
+    # export each output part into its own STL file, named by prefix and part name
+    def export_stl(self,prefix = ""):
+        for name in self.part_names:
+            cq.exporters.export(getattr(self,name), prefix + name + ".stl",
+                tolerance = self.stl_tolerance, angularTolerance = self.stl_angular_tolerance)
+
     #build the full model
     def build(self):
-        # build the motor half of the bracket from its pieces
-        # and combine the pieces into one.
-        self.left_plate_motor  = self.build_side("left","motor")
-        self.right_plate_motor = self.build_side("right","motor")
-        self.belt_rest_motor   = self.build_belt_rest("motor")
-        self.connector_motor   = self.build_connector("motor")
-        self.belt_bracket_motor = self.belt_bracket_motor\
-            .union(self.left_plate_motor)\
-            .union(self.right_plate_motor)\
-            .union(self.belt_rest_motor)\
-            .union(self.connector_motor)
-
-        # build the other half of the bracket from its pieces
-        # and combine the pieces into one.
-        self.left_plate_roller  = self.build_side("left","roller")
-        self.right_plate_roller = self.build_side("right","roller")
-        self.belt_rest_roller   = self.build_belt_rest( "roller")
-        self.connector_roller   = self.build_connector("roller")
-        self.tensioner_left     = self.build_tensioner("left")
-        self.tensioner_right    = self.build_tensioner("right")
-        self.belt_bracket_roller = self.belt_bracket_roller\
-            .union(self.left_plate_roller)\
-            .union(self.right_plate_roller)\
-            .union(self.belt_rest_roller)\
-            .union(self.connector_roller)\
-            .union(self.tensioner_left)\
-            .union(self.tensioner_right)
-
-        # create the roller on the motor side of the bracket
-        # it will by default be in the XY plane in Z-direction
-        # so it hsa to be rotated and translated in place            
-        self.motor_roller = self.motor_roller\
-            .union(self.build_roller("motor"))\
-            .rotate((-1,0,self.rl/2),(1,0,self.rl/2),-90)\
-            .translate((0,0,-self.bl+self.bh/2-self.rl/2))
-
-        #same for the other rolder 
-        self.other_roller = self.other_roller\
-            .union(self.build_roller("roller"))\
-            .rotate((-1,0,self.rl/2),(1,0,self.rl/2),90)\
-            .translate((0,0,self.bl-self.bh/2-self.rl/2+5))
-       
-        # create the axis - belt tensioner connectors 
-        # and rotate and translate them into place
-        self.axis_connector_left = self.axis_connector_left\
-            .union(self.build_tensioner_axis_connector())\
-            .rotate((0,-1,0),(0,1,0),90)\
-            .rotate((0,0,-1),(0,0,1),90)\
-            .translate((0,-self.bw/2-self.mtb-2*self.td-self.nsp*self.ns,self.bl-self.bh/2+5))
+        # without a known nut size, there is nothing to build (see __init__())
+        if (self.td not in self.m_nuts): return
 
-        self.axis_connector_right = self.axis_connector_right\
-            .union(self.build_tensioner_axis_connector())\
-            .rotate((0,-1,0),(0,1,0),90)\
-            .rotate((0,0,-1),(0,0,1),90)\
-            .translate((0,self.bw/2+self.mtb+self.nsp*self.ns,self.bl-self.bh/2+5))
+        # The output parts build the parts they are made from on first use.
+        # They are built one after the other, not in parallel threads. The builders
+        # share workplanes, and so CadQuery contexts with their pending wires and tags, and
+        # the parts built from others share their shapes, which OpenCascade may modify
+        # during boolean operations. Neither is thread-safe.
+        for name in self.part_names: getattr(self,name)
 
 
 
@@ -401,11 +491,8 @@ class ConveyorUnit:
 # =============================================================================
 
 cq.Workplane.part = utilities.part
+cq.Workplane.union_all = utilities.union_all
 
-# True to be able to export everything in a single STEP file. False to be able to selectively show 
-# and hide objects in cq-editor.
-union_results = False
-show_options = {"color": "grey", "alpha": 0}
 measures = dict(
     belt_width                 = 50,  #desired belt width 
     bracket_height             = 35,  #height of the brackt
@@ -429,12 +516,31 @@ measures = dict(
     tensioner_bolt_size        = 4    #bolt size (DIN) for tensioner 
 )
 
-# Create case as a Case object to get access to its parts.
-belt = ConveyorUnit(cq.Workplane("XY"), measures)
-    
-show_object(belt.belt_bracket_motor,   name = "belt_bracket_motor",   options = show_options)
-show_object(belt.belt_bracket_roller,  name = "belt_bracket_roller",  options = show_options)
-show_object(belt.motor_roller,  name = "motor_roller",  options = show_options)
-show_object(belt.other_roller,  name = "other_roller",  options = show_options)
-show_object(belt.axis_connector_left,  name = "axis_connector_left",  options = show_options)
-show_object(belt.axis_connector_right,  name = "axis_connector_right",  options = show_options)
+# Only build and show the model when run as a script in cq-editor, which provides show_object().
+# When imported, e.g. to use ConveyorUnit elsewhere, nothing is built.
+if "show_object" in globals():
+    # True to be able to export everything in a single STEP file. False to be able to selectively show 
+    # and hide objects in cq-editor and be able to export them to one STEP file each.
+    union_results = False
+    show_options = {"color": "grey", "alpha": 0}
+
+    # Create case as a Case object to get access to its parts.
+    # Parts are built on first use. build() builds all of them at once.
+    belt = ConveyorUnit(cq.Workplane("XY"), measures)
+    belt.build()
+
+    if union_results:
+        show_object(belt.compound, name = "conveyor_unit", options = show_options)
+    else:
+        show_object(belt.belt_bracket_motor,   name = "belt_bracket_motor",   options = show_options)
+        show_object(belt.belt_bracket_roller,  name = "belt_bracket_roller",  options = show_options)
+        show_object(belt.motor_roller,  name = "motor_roller",  options = show_options)
+        show_object(belt.other_roller,  name = "other_roller",  options = show_options)
+        show_object(belt.axis_connector_left,  name = "axis_connector_left",  options = show_options)
+        show_object(belt.axis_connector_right,  name = "axis_connector_right",  options = show_options)
+
+# When run from the command line, export each part into an STL file for printing instead.
+elif __name__ == "__main__":
+    belt = ConveyorUnit(cq.Workplane("XY"), measures)
+    belt.build()
+    belt.export_stl("conveyor_unit_")
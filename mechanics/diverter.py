@@ -1,13 +1,19 @@
 import cadquery as cq
-import cadquery.selectors as cqs
-import logging, importlib
+import logging, importlib, sys
 from types import SimpleNamespace as Measures
 from math import cos, sin, pi, radians, degrees
 import utilities # Local directory import.
 
-# Selective reloading to pick up changes made between script executions.
+# Selective reloading to pick up changes made between script executions. Only needed when running 
+# inside CQ-editor, elsewhere the module has just been imported anyway.
 # See: https://github.com/CadQuery/CQ-editor/issues/99#issue-525367146
-importlib.reload(utilities)
+if "cq_editor" in sys.modules: importlib.reload(utilities)
+
+# Register the CadQuery plugins needed for building the model, once when importing this module.
+cq.Workplane.distribute_circular = utilities.distribute_circular
+cq.Workplane.angle_sector = utilities.angle_sector
+cq.Workplane.shaft_outline = utilities.shaft_outline
+cq.Workplane.union_all = utilities.union_all
 
 class Diverter:
 
@@ -33,7 +39,6 @@ class Diverter:
                 angle lean towards the center, negative away from it.
             - TODO: Add the documentation of the remaining measures.
 
-        .. todo:: Move calculations of derived measures into the initializer.
         .. todo:: Use fillets on the sharp edges of the shaft collar.
         .. todo:: Fix that the upper wire of the shovels does not reach in radially inside as much as 
             it should. That is because it is drawn on an inclined plane, which shortens its 
@@ -45,11 +50,6 @@ class Diverter:
             "depth of a hole", which is always a local measure. In that case, rename the measures.
         """
 
-        cq.Workplane.distribute_circular = utilities.distribute_circular
-        cq.Workplane.angle_sector = utilities.angle_sector
-        cq.Workplane.shaft_outline = utilities.shaft_outline
-        cq.Vector.toTuple2D = utilities.toTuple2D
-
         self.baseplane = workplane # To keep a re-usable reference to an unmodified workplane.
         self.debug = False
         self.measures = measures
@@ -62,6 +62,20 @@ class Diverter:
         self.measures.bolts.nuthole_depth_position = \
             0.4 * (self.measures.bolts.clamp_length - self.measures.shaft.clamp_gap)
 
+        # Further derived measures, calculated once here instead of in every build method using them.
+        m = self.measures
+        m.baseplate.radius = m.baseplate.diameter / 2
+        m.shaft.collar_outer_radius = m.shaft.collar_outer_diameter / 2
+        m.shaft.collar_inner_radius = m.shaft.collar_inner_diameter / 2
+        m.bolts.nutholes_offset = m.bolts.nuthole_depth_position + 0.5 * m.bolts.nuthole_depth
+        # Since the two arcs are at an angle (see center_angle), the minimum thickness of a shovel 
+        # is less than m.shovels.cavity. TODO: Make this parametric in a reasonable way.
+        m.shovels.depth = m.shovels.cavity * 2 - 3.0
+        # Angle (in radians) at which the outer extension of a shovel appears from the baseplate 
+        # center. TODO: Make the center angle configurable in a reasonable way. Currently it is 
+        # derived from the number of shovels using a statis factor (0.45).
+        m.shovels.center_angle = radians(360 / m.shovels.count) * 0.45
+
         # TODO: Initialize missing measures with defaults.
 
         self.build()
@@ -69,10 +83,10 @@ class Diverter:
 
     def build_collar(self, half = "right", clamp_gap = 0.0):
         m = self.measures
-        outer_r = m.shaft.collar_outer_diameter / 2
+        outer_r = m.shaft.collar_outer_radius
         # To provide wiggling space for mounting, the loose part of the collar has to be smaller.
         if half == "left": outer_r -= 1.5
-        inner_r = m.shaft.collar_inner_diameter / 2
+        inner_r = m.shaft.collar_inner_radius
         clamp_gap_offset = clamp_gap if half == "right" else -clamp_gap
         # Due to a bug in utilities.angle_sector, the numerically smaller angle is always used as 
         # the start angle. So for the right half, we have to express it as a negative number instead 
@@ -99,8 +113,13 @@ class Diverter:
             .shaft_outline(diameter = m.shaft.diameter, flatten = m.shaft.flatten)
             .cutThruAll()
 
+            # Vertical plane through the shaft axis, with its normal pointing to -x. Rotated only 
+            # once and tagged, as the clamp gap cut, the bolt holes and build_clamp_block() use it.
+            .transformed(rotate = (0, -90, 0))
+            .tag("collar_side")
+
             # Cut off space for the clamp gap.
-            .transformed(offset = (clamp_gap_offset, 0, 0), rotate = (0, -90, 0))
+            .transformed(offset = (0, 0, -clamp_gap_offset))
             #.box(100, 100, 1)
             .split(
                 keepBottom = True if  half == "right" else False,
@@ -108,11 +127,10 @@ class Diverter:
             )
 
             # Bolt holes.
-            .workplaneFromTagged("collar_bottom")
             # TODO: Change the workplane transformation so that the global y axis is the x axis of 
             # the resulting workplane. That allows to switch the coordinates in moveTo() to the 
             # intuitive order.
-            .transformed(rotate = (0, -90, 0))
+            .workplaneFromTagged("collar_side")
             .moveTo(m.bolts.hole_position_vertical, m.bolts.hole_position_radial)
             .circle(m.bolts.hole_size / 2)
             .moveTo(m.bolts.hole_position_vertical, - m.bolts.hole_position_radial)
@@ -130,61 +148,55 @@ class Diverter:
         The origin is located at its outer edge, centered between the opposiong shovel cavities, 
         on the bottom face of the object, and so that the shovel openings point towards +y and -y.
 
+        Only one shovel is built, as its loft and fillet are the most expensive part of the 
+        diverter. distribute_circular() then places it as often as needed.
+
         :return: A Cadquery Workplane object with a solid on the stack representing the shovel.
         """
 
-        def shovel_profile(self, m):
-            width = m.shovels.size
-            # Since the two arcs are at an angle (see center_angle_rad), the minimum thickness 
-            # is less than m.shovels.cavity. TODO: Make this parametric in a reasonable way.
-            depth = m.shovels.cavity * 2 - 3.0
-            circumradius = m.baseplate.diameter / 2
-            # Angle at which the outer extension of the shovel appears from the baseplate center.
-            # TODO: Make the center angle configurable in a reasonable way. Currently it is 
-            # derived from the number of shovels using a statis factor (0.45).
-            center_angle_rad = radians(360 / m.shovels.count) * 0.45
-
-            # Profile corner points.
-            left_bottom = cq.Vector((-width, -depth / 2))
-            right_bottom = (
-                (cq.Vector((circumradius, 0)) * -1)
-                + (cq.Vector(cos(center_angle_rad / 2), -sin(center_angle_rad / 2)) * circumradius)
-            )
-            right_center = cq.Vector((0, 0))
-            right_top = (
-                cq.Vector((circumradius, 0)) * -1
-                + cq.Vector(cos(center_angle_rad / 2), sin(center_angle_rad / 2)) * circumradius
-            )
-            left_top = cq.Vector((-width, depth / 2))
-
-            profile = (
-                self
-                .moveTo(left_bottom.x, left_bottom.y)
-                .sagittaArc(right_bottom.toTuple2D(), m.shovels.cavity)
-                .threePointArc(right_center.toTuple2D(), right_top.toTuple2D())
-                .sagittaArc(left_top.toTuple2D(), m.shovels.cavity)
+        m = self.measures
+        width = m.shovels.size
+        depth = m.shovels.depth
+        circumradius = m.baseplate.radius
+        center_angle_rad = m.shovels.center_angle
+
+        # Profile corner points. The same for both profiles, so calculated only once.
+        outer_x = -circumradius + cos(center_angle_rad / 2) * circumradius
+        outer_y = sin(center_angle_rad / 2) * circumradius
+        left_bottom = (-width, -depth / 2)
+        right_bottom = (outer_x, -outer_y)
+        right_center = (0, 0)
+        right_top = (outer_x, outer_y)
+        left_top = (-width, depth / 2)
+
+        # A plain function rather than a plugin, so that building a shovel does not modify 
+        # cq.Workplane every time.
+        def shovel_profile(workplane):
+            return (
+                workplane
+                .moveTo(*left_bottom)
+                .sagittaArc(right_bottom, m.shovels.cavity)
+                .threePointArc(right_center, right_top)
+                .sagittaArc(left_top, m.shovels.cavity)
                 .close()
             )
 
-            return self.newObject(profile.objects)
-
-        cq.Workplane.shovel_profile = shovel_profile
-        m = self.measures
+        # Draw the lower wire.
+        # TODO: Rather use the workplane passed in through self.baseplane.
+        lower = shovel_profile(cq.Workplane("XY"))
+
+        # Draw the upper_wire.
+        # TODO: Make the x offset parametric. It can be used to make the shovels protrude 
+        # over the baseplate, so that they are pointing straight down if the baseplate is 
+        # mounted at an angle. It also means that the diverter wheel needs more space and that 
+        # the shovels cannot align with the belt side walls perfectly because they are 
+        # inclined now.
+        upper = shovel_profile(
+            lower.transformed(rotate = (0, m.baseplate.inclination, 0), offset = (0, 0, m.shovels.height))
+        )
 
         return (
-            cq.Workplane("XY") # TODO: Rather use the workplane passed in through self.baseplane.
-            # Draw the lower wire.
-            .shovel_profile(m)
-
-            # Draw the upper_wire.
-            # TODO: Make the x offset parametric. It can be used to make the shovels protrude 
-            # over the baseplate, so that they are pointing straight down if the baseplate is 
-            # mounted at an angle. It also means that the diverter wheel needs more space and that 
-            # the shovels cannot align with the belt side walls perfectly because they are 
-            # inclined now.
-            .transformed(rotate = (0, m.baseplate.inclination, 0), offset = (0, 0, m.shovels.height))
-            .shovel_profile(m)
-
+            upper
             .loft(combine = True)
             .faces(">Z")
             .fillet(1.5)
@@ -192,11 +204,11 @@ class Diverter:
 
     def build_wheel(self):
         m = self.measures
-        nutholes_offset = m.bolts.nuthole_depth_position + 0.5 * m.bolts.nuthole_depth
+        nutholes_offset = m.bolts.nutholes_offset
 
         result = (
             self.baseplane
-            .circle(m.baseplate.diameter / 2)
+            .circle(m.baseplate.radius)
             .extrude(m.baseplate.thickness)
 
             # Create the shaft collar (resp. half of it, as it's split for clamping).
@@ -205,16 +217,13 @@ class Diverter:
             .tag("baseplate_topface")
             .union(self.build_collar(half = "right"))
 
-            # Cut the shaft hole.
-            .workplaneFromTagged("baseplate_topface")
-            .shaft_outline(diameter = m.shaft.diameter, flatten = m.shaft.flatten)
-            .cutThruAll()
-
-            # Cut the nut holes.
-            # TODO: This should be better in build_collar() but cannot because it also has to cut 
-            #   through the baseplate. Maybe rename to build_base() or transform to a plugin that 
-            #   will both add the collar and cut the holes.
+            # Cut the shaft hole and the nut holes, all in one cut. Both are drawn on the collar 
+            # bottom, which is in the same plane as the baseplate top face.
+            # TODO: The nut holes should be better in build_collar() but cannot because they also 
+            #   have to cut through the baseplate. Maybe rename to build_base() or transform to a 
+            #   plugin that will both add the collar and cut the holes.
             .workplaneFromTagged("collar_bottom") # Comes from build_collar() above.
+            .shaft_outline(diameter = m.shaft.diameter, flatten = m.shaft.flatten)
             .moveTo(nutholes_offset, m.bolts.hole_position_radial)
             .rect(m.bolts.nuthole_depth, m.bolts.nuthole_width)
             .moveTo(nutholes_offset, -m.bolts.hole_position_radial)
@@ -228,7 +237,7 @@ class Diverter:
                 # To prevent CAD kernel issues when union'ing everything together, the shovel's 
                 # outer arc should not be coincident with the baseplate arc. We offset the shovel 
                 # by 0.01 mm to the inside to guarantee that.
-                radius = m.baseplate.diameter / 2 - 0.1,
+                radius = m.baseplate.radius - 0.1,
                 copies = m.shovels.count,
                 align = "center"
             )
@@ -244,22 +253,21 @@ class Diverter:
             .union(self.build_collar(half = "left", clamp_gap = m.shaft.clamp_gap))
 
             # Create a plain surface for the boltheads.
-            .workplaneFromTagged("collar_bottom")
-            .transformed(offset = (-m.shaft.clamp_gap - m.shaft.clamp_block_thickness, 0, 0), rotate = (0, -90, 0))
+            .workplaneFromTagged("collar_side") # Comes from build_collar() above.
+            .transformed(offset = (0, 0, m.shaft.clamp_gap + m.shaft.clamp_block_thickness))
             .split(keepBottom = True)
         )
         return result
 
 
     def build(self):
+        # Built one after the other, as both chains start from self.baseplane and so share its 
+        # CadQuery context with the pending wires and tags, which is not thread-safe.
         self.wheel = self.build_wheel()
         self.clamp_block = self.build_clamp_block()
 
-        self.model = (
-            self.baseplane
-            .union(self.wheel)
-            .union(self.clamp_block)
-        )
+        # Both parts in one union, as the baseplane has no solid to union them with.
+        self.model = self.baseplane.union_all(self.wheel, self.clamp_block)
 
 
 # =============================================================================
@@ -267,10 +275,6 @@ class Diverter:
 # =============================================================================
 cq.Workplane.part = utilities.part
 
-# True to be able to export everything in a single STEP file. False to be able to selectively show 
-# and hide objects in cq-editor and be able to export them to one STEP file each.
-union_results = False
-
 measures = Measures(
     baseplate = Measures(
         diameter = 90.0,
@@ -306,14 +310,26 @@ measures = Measures(
         clamp_length = 25.0 # Good for using M3×15 bolts.
     )
 )
-show_options = {"color": "lightgray", "alpha": 0}
-
-if union_results:
-    diverter = cq.Workplane("XY").part(Diverter, measures)
-    show_object(diverter, name = "diverter", options = show_options)
-else:
-    # Create the model as a Diverter object to get access to its parts.
-    diverter = Diverter(cq.Workplane("XY"), measures)    
-    show_object(diverter.wheel, name = "diverter_wheel", options = show_options)
-    show_options = {"color": "orange", "alpha": 0}
-    show_object(diverter.clamp_block, name = "diverter_clamp_block", options = show_options)
+
+# Only build and show the model when run as a script in cq-editor, which provides show_object().
+# When imported, e.g. to use Diverter elsewhere, nothing is built.
+if "show_object" in globals():
+    # True to be able to export everything in a single STEP file. False to be able to selectively show 
+    # and hide objects in cq-editor and be able to export them to one STEP file each.
+    union_results = False
+    show_options = {"color": "lightgray", "alpha": 0}
+
+    if union_results:
+        diverter = cq.Workplane("XY").part(Diverter, measures)
+        show_object(diverter, name = "diverter", options = show_options)
+    else:
+        # Create the model as a Diverter object to get access to its parts.
+        diverter = Diverter(cq.Workplane("XY"), measures)
+        show_object(diverter.wheel, name = "diverter_wheel", options = show_options)
+        show_options = {"color": "orange", "alpha": 0}
+        show_object(diverter.clamp_block, name = "diverter_clamp_block", options = show_options)
+
+# When run from the command line, export the model to a STEP file instead, without rendering it.
+elif __name__ == "__main__":
+    diverter = Diverter(cq.Workplane("XY"), measures)
+    cq.exporters.export(diverter.model, "diverter.step")
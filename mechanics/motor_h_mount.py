@@ -1,11 +1,12 @@
 import cadquery as cq
-import logging, importlib
+import logging, importlib, sys
 from types import SimpleNamespace as Measures
 import utilities # Local directory import.
 
-# Selective reloading to pick up changes made between script executions.
+# Selective reloading to pick up changes made between script executions. Only needed when running 
+# inside CQ-editor, elsewhere the module has just been imported anyway.
 # See: https://github.com/CadQuery/CQ-editor/issues/99#issue-525367146
-importlib.reload(utilities)
+if "cq_editor" in sys.modules: importlib.reload(utilities)
 
 log = logging.getLogger(__name__)
 
@@ -47,10 +48,6 @@ class MotorHMount:
             and holes to the bottom, esp. to the bottom of the spaces between the ribs.
         """
 
-        cq.Workplane.combine_wires = utilities.combine_wires
-        cq.Workplane.add_rect = utilities.add_rect
-        cq.Workplane.translate_last = utilities.translate_last
-
         self.model = workplane
         self.debug = False
         self.measures = measures
@@ -74,46 +71,60 @@ class MotorHMount:
         offset = m.brackets.width / 2
         v_spacing = (m.height - 2 * offset) / (m.brackets.hole_count - 1)
         h_spacing = m.width_over_all - 2 * offset
-        points = []
 
         # Go row-wise through all points from bottom to top and collect their coordinates.
         # (Origin is assumed in the lower left of the part's back surface.)
-        for row in range(m.brackets.hole_count):
-            for column in range(2):
-                points.append((
-                    offset + column * h_spacing,
-                    offset + row * v_spacing
-                ))
-
-        return points
+        return [
+            (offset + column * h_spacing, offset + row * v_spacing)
+            for row in range(m.brackets.hole_count)
+            for column in range(2)
+        ]
 
 
-    def build(self):
+    def mounthole_points(self):
         m = self.measures
 
-        self.model = (
-            self.model
+        # Center of the motor axle, in the same coordinates as brackethole_points(). The holes go 
+        # through the faceplate only, as they are between the side walls and above the bottom wall.
+        center_x = m.width_over_all / 2
+        center_y = m.wall_thickness + m.motor_height / 2
+        offset = m.faceplate.mounthole_distance / 2
 
-            # First create an U profile, with two flaps at the upper end pointing outwards.
+        return [
+            (center_x + x_offset, center_y + y_offset)
+            for y_offset in (-offset, offset)
+            for x_offset in (-offset, offset)
+        ]
 
-            # Front wall profile
-            .add_rect(m.width, m.wall_thickness)
-            .translate_last((0, m.wall_thickness / 2))
 
-            # Side wall profiles
-            .add_rect(m.wall_thickness, m.depth)
-            .translate_last((m.width / 2 - m.wall_thickness / 2, m.depth / 2))
-            .add_rect(m.wall_thickness, m.depth)
-            .translate_last((-m.width / 2 + m.wall_thickness / 2, m.depth / 2))
+    def build(self):
+        m = self.measures
 
-            # Back wall bracket profiles
-            .add_rect(m.brackets.width, m.wall_thickness, centered = False)
-            .translate_last((m.width / 2, m.depth - m.wall_thickness))
-            .add_rect(m.brackets.width, m.wall_thickness, centered = False)
-            .translate_last((-m.width / 2 - m.brackets.width, m.depth - m.wall_thickness))
+        self.model = (
+            self.model
 
-            # Union the wires to create the desired U profile, then extrude it.
-            .combine_wires().toPending()
+            # First create an U profile, with two flaps at the upper end pointing outwards. Drawn 
+            # as a single polygon, starting at the outer front left corner and going around 
+            # counter-clockwise, so that no wires have to be unioned. Then extrude it.
+            .polyline([
+                # Front wall
+                (-m.width / 2, 0),
+                (m.width / 2, 0),
+                # Right side wall and bracket
+                (m.width / 2, m.depth - m.wall_thickness),
+                (m.width / 2 + m.brackets.width, m.depth - m.wall_thickness),
+                (m.width / 2 + m.brackets.width, m.depth),
+                (m.width / 2 - m.wall_thickness, m.depth),
+                # Inner side of the front wall
+                (m.width / 2 - m.wall_thickness, m.wall_thickness),
+                (-m.width / 2 + m.wall_thickness, m.wall_thickness),
+                # Left side wall and bracket
+                (-m.width / 2 + m.wall_thickness, m.depth),
+                (-m.width / 2 - m.brackets.width, m.depth),
+                (-m.width / 2 - m.brackets.width, m.depth - m.wall_thickness),
+                (-m.width / 2, m.depth - m.wall_thickness)
+            ])
+            .close()
             .extrude(m.height)
 
             # Add the bottom wall.
@@ -132,19 +143,16 @@ class MotorHMount:
                 m.faceplate.mainhole_cbore_depth
             )
 
-            # Cut the four motor mount holes.
-            .workplane()
-            .rect(m.faceplate.mounthole_distance, m.faceplate.mounthole_distance, forConstruction = True)
-            .vertices()
-            .circle(m.faceplate.mounthole_diameter / 2)
-            .cutThruAll()
-
-            # Add the bolt holes on the brackets.
+            # Add the bolt holes on the brackets and the four motor mount holes, all in one cut. 
+            # Both go through the part in y direction, so the mount holes can be drawn on the back 
+            # face as well.
             # Create a workplane on the lower right corner of the back face. See:
             # https://cadquery.readthedocs.io/en/latest/examples.html#locating-a-workplane-on-a-vertex
             .faces(">Y").vertices(">(1,0,-1)").workplane(centerOption="CenterOfMass")
             .pushPoints(self.brackethole_points())
             .circle(m.brackets.hole_diameter / 2)
+            .pushPoints(self.mounthole_points())
+            .circle(m.faceplate.mounthole_diameter / 2)
             .cutThruAll()
 
             # Add fillets to the edges between motor case and wall mount brackets.
@@ -1,11 +1,12 @@
 import cadquery as cq
-import logging, importlib
+import logging, importlib, sys
 from types import SimpleNamespace as Measures
 import utilities # Local directory import.
 
-# Selective reloading to pick up changes made between script executions.
+# Selective reloading to pick up changes made between script executions. Only needed when running 
+# inside CQ-editor, elsewhere the module has just been imported anyway.
 # See: https://github.com/CadQuery/CQ-editor/issues/99#issue-525367146
-importlib.reload(utilities)
+if "cq_editor" in sys.modules: importlib.reload(utilities)
 
 log = logging.getLogger(__name__)
 
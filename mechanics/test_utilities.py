@@ -0,0 +1,27 @@
+import pytest
+
+cq = pytest.importorskip("cadquery")
+
+import utilities
+
+cq.Workplane.distribute_circular = utilities.distribute_circular
+
+
+def test_distribute_circular_on_empty_workplane():
+    cube = cq.Workplane("XY").box(2, 2, 2)
+
+    result = cq.Workplane("XY").distribute_circular(cube, radius = 10, copies = 4, align = "center")
+
+    assert len(result.solids().vals()) == 4
+    assert result.val().Volume() == pytest.approx(4 * 8)
+
+
+def test_distribute_circular_onto_solid():
+    cube = cq.Workplane("XY").box(2, 2, 2)
+    plate = cq.Workplane("XY").box(30, 30, 1)
+
+    result = plate.distribute_circular(cube, radius = 10, copies = 4, align = "center")
+
+    # The copies overlap the plate, so all is unioned into one solid.
+    assert len(result.solids().vals()) == 1
+    assert result.val().Volume() == pytest.approx(30 * 30 * 1 + 4 * (8 - 2 * 2 * 1))
@@ -2,15 +2,18 @@ import cadquery as cq
 from cadquery import selectors
 import logging
 import importlib
+import sys
 from math import sqrt, cos, sin, asin, acos, degrees, radians
 from types import SimpleNamespace as Measures
 import utilities # Local directory import.
 import wall_insert # Local directory import.
 
-# Selective reloading to pick up changes made between script executions.
+# Selective reloading to pick up changes made between script executions. Only needed when running 
+# inside CQ-editor, elsewhere the modules have just been imported anyway.
 # See: https://github.com/CadQuery/CQ-editor/issues/99#issue-525367146
-importlib.reload(utilities)
-importlib.reload(wall_insert)
+if "cq_editor" in sys.modules:
+    importlib.reload(utilities)
+    importlib.reload(wall_insert)
 
 # In addition to importing whole packages as neededfor importlib.reload(), import some names.
 from wall_insert import WallInsert
@@ -1247,6 +1247,50 @@ def test_first_solid():
 #test_first_solid()
 
 
+def union_all(self, *others, clean = True):
+    """
+    CadQuery plugin that unions the solids on the stack with the first solid of each given 
+    workplane, all in a single boolean operation.
+
+    This is faster than chaining Workplane::union() calls, as each of these rebuilds the combined 
+    shape again, while OpenCascade's fuse can process all operands together. Example usage:
+
+    ```
+    model = (
+        cq.Workplane("XY")
+        .union_all(left_part, right_part, connector)
+    )
+    ```
+
+    :param others: Workplane objects with the solids to union.
+    :param clean: Whether to call Shape::clean() on the result, as Workplane::union() does.
+    :return: A Workplane object with the combined solid on the stack (besides nothing else).
+    """
+    solids = self.solids().vals() + [other.findSolid() for other in others]
+    if len(solids) < 2: return self.newObject(solids) # Nothing to union for 0 or 1 solids.
+
+    result = solids[0].fuse(*solids[1:])
+    if clean: result = result.clean()
+
+    return self.newObject([result])
+
+
+def test_union_all():
+    cq.Workplane.union_all = union_all
+
+    result = (
+        cq.Workplane("XY")
+        .union_all(
+            cq.Workplane("XY").box(10,10,5),
+            cq.Workplane("XY").box(5,5,10),
+            cq.Workplane("XY").cylinder(15, 2)
+        )
+    )
+    show_object(result)
+
+#test_union_all()
+
+
 def bracket(self, thickness, height, width, offset = 0, angle = 90,
     holes_count = 0, holes_diameter = None, holes_tag = None,
     edge_fillet = None, edge_chamfer = None, 
@@ -1959,41 +2003,34 @@ def distribute_circular(self, distributable, radius, copies, align):
     :param align: Alignment type. Either "default" to use the original orientation of the 
         distributable object, or "center" to let every copy of the object face the center.
     """
-    log = logging.getLogger(__name__)
-
     # Determine the CadQuery primitive "Plane" object wrapped by the Workplane object. See: 
     # https://cadquery.readthedocs.io/en/latest/_modules/cadquery/cq.html#Workplane
     plane = self.plane
 
-    # Positions and rotations for the distributable object when placed at the corners of a regular polygon.
-    # Consists of a list of (x, y, center_angle) elements, using local coordinates and degrees.
-    transformations = []
+    delta_angle = 2 * pi / copies # Center angle between two corners. In radians.
+
+    # Place a rotated and translated copy of the distributable object at every corner of a regular 
+    # polygon. Each copy only gets a new location, sharing the geometry of the distributable object, 
+    # and all copies are then unioned in a single boolean operation.
+    shape = distributable.findSolid()
+    placed = []
     for corner_num in range(copies): # Range 0 to copies - 1.
-        delta_angle = 2 * pi / copies # Center angle between two corners. In radians.
         corner_angle = delta_angle * corner_num
-        transformation = (
-            cos(corner_angle) * radius,
-            sin(corner_angle) * radius,
-            degrees(corner_angle)
-        )
-        transformations.append(transformation)
-        # log.info("new position: %s", position)
-
-    # Collect a translated and rotated copy of the distributable object for every corner.
-    result = self
-    for t in transformations:
-        angle = t[2] if align == "center" else 0
-        position = plane.toWorldCoords((t[0], t[1], 0))
-
-        result = result.union(
-            distributable
-            .rotate((0, 0, -1), (0, 0, 1), angle)
-            .translate(cq.Vector(position))
-        )
+        angle = degrees(corner_angle) if align == "center" else 0
+        position = plane.toWorldCoords((cos(corner_angle) * radius, sin(corner_angle) * radius, 0))
+        location = cq.Location(position) * cq.Location(cq.Vector(), cq.Vector(0, 0, 1), angle)
+        placed.append(shape.moved(location))
+
+    try:
+        base = self.findSolid()
+    except ValueError:
+        # Nothing to union the copies with yet, so union them with each other.
+        base, placed = placed[0], placed[1:]
+    result = base.fuse(*placed).clean() if placed else base
 
     # In CadQuery plugins, it is good practice to not modify self, but to return a new object linked 
     # to self as a parent: https://cadquery.readthedocs.io/en/latest/extending.html#preserving-the-chain
-    return self.newObject(result.objects)
+    return self.newObject([result])
 
 
 def toTuple2D(self):
@@ -2,12 +2,14 @@ import cadquery as cq
 from cadquery import selectors
 import logging
 import importlib
+import sys
 from types import SimpleNamespace as Measures
 import utilities # Local directory import.
 
-# Selective reloading to pick up changes made between script executions.
+# Selective reloading to pick up changes made between script executions. Only needed when running 
+# inside CQ-editor, elsewhere the module has just been imported anyway.
 # See: https://github.com/CadQuery/CQ-editor/issues/99#issue-525367146
-importlib.reload(utilities)
+if "cq_editor" in sys.modules: importlib.reload(utilities)
 
 # Register imported CadQuery plugins.
 cq.Workplane.part = utilities.part